@@ -1,7 +1,21 @@
 """Managers."""
 
-from .catchup_manager import CatchupManager
-from .iptv_manager import IPTVManager
-from .stream_manager import StreamManager
+from importlib import import_module
 
-__all__ = ["CatchupManager", "IPTVManager", "StreamManager"]
+_MANAGER_MODULES = {
+    "CatchupManager": ".catchup_manager",
+    "DebugManager": ".debug_manager",
+    "ExportManager": ".export_manager",
+    "IPTVManager": ".iptv_manager",
+    "StreamManager": ".stream_manager",
+}
+
+__all__ = ["CatchupManager", "DebugManager", "ExportManager", "IPTVManager", "StreamManager"]
+
+
+def __getattr__(name: str):
+    """Import managers on first access, so that each route only loads what it needs."""
+    if name not in _MANAGER_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(import_module(_MANAGER_MODULES[name], __name__), name)
@@ -1,10 +1,18 @@
 """Catchup TV Manager."""
 
+from threading import Thread
+from urllib.parse import urlsplit
+
+import xbmc
 import xbmcplugin
 
 from lib.providers import get_provider
 from lib.router import router
+from lib.utils.artwork import ArtworkCache, is_artwork_cache_enabled
 from lib.utils.gui import create_list_item
+from lib.utils.kodi import get_addon_setting, log
+
+_CATCHUP_PATH_PREFIX = "/catchup/"
 
 
 class CatchupManager:
@@ -18,9 +26,34 @@ class CatchupManager:
         """Build catchup TV directory."""
         levels = levels.split("/") if levels else []
         items = self.provider.get_catchup_items(levels)
+        artwork = ArtworkCache() if is_artwork_cache_enabled() else None
 
         for item in items:
+            if artwork is not None and "art" in item:
+                item["art"] = artwork.localize(item["art"])
+
             is_folder = item.get("is_folder")
             xbmcplugin.addDirectoryItem(router.handle, item["path"], create_list_item(item, is_folder), is_folder)
 
         xbmcplugin.endOfDirectory(router.handle)
+
+        # Directory is already displayed: the next levels are loaded while the user is browsing it
+        prefetched_levels = self._get_child_levels(items)[: get_addon_setting("catchup.prefetch_items", int)]
+
+        if len(prefetched_levels) > 0:
+            Thread(target=self._prefetch, args=(prefetched_levels,), name="catchup-prefetch").start()
+
+        if artwork is not None:
+            Thread(target=artwork.download_pending, name="catchup-artwork").start()
+
+    def _get_child_levels(self, items: list) -> list:
+        """Return the catchup levels the folder items lead to."""
+        paths = [urlsplit(item["path"]).path for item in items if item.get("is_folder")]
+        return [path[len(_CATCHUP_PATH_PREFIX) :].split("/") for path in paths if path.startswith(_CATCHUP_PATH_PREFIX)]
+
+    def _prefetch(self, levels_list: list) -> None:
+        """Prefetch catchup items, as a best effort."""
+        try:
+            self.provider.prefetch_catchup_items(levels_list)
+        except Exception as e:
+            log(f"Cannot prefetch catchup items: {e}", xbmc.LOGWARNING)
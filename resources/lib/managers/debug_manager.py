@@ -0,0 +1,39 @@
+"""Debug Manager."""
+
+import xbmcplugin
+
+from lib.router import router
+from lib.utils.gui import create_list_item
+from lib.utils.metrics import load_metrics_summary
+
+
+class DebugManager:
+    """Display debug information collected by the addon."""
+
+    def build_metrics_directory(self) -> None:
+        """Build a directory listing request metrics per endpoint."""
+        for metrics in load_metrics_summary():
+            requests = metrics["requests"]
+            average_ms = metrics.get("elapsed_ms_total", 0) / max(1, metrics.get("elapsed_ms_count", 0))
+            item = {
+                "label": f"{metrics['endpoint']} - {requests} req. - {average_ms:.0f} ms - {metrics['errors']} err.",
+                "path": "",
+                "info": {"plot": self._format_metrics(metrics)},
+            }
+            # Rows only display metrics: selecting one neither plays nor opens anything
+            list_item = create_list_item(item)
+            list_item.setProperty("IsPlayable", "false")
+            xbmcplugin.addDirectoryItem(router.handle, item["path"], list_item, False)
+
+        xbmcplugin.endOfDirectory(router.handle)
+
+    def _format_metrics(self, metrics: dict) -> str:
+        """Format average and max values of each metric."""
+        lines = [metrics["endpoint"], f"Requests: {metrics['requests']}", f"Errors: {metrics['errors']}"]
+
+        for key in ["elapsed_ms", "headers_ms", "download_ms", "decode_ms", "size"]:
+            if metrics.get(f"{key}_count"):
+                average = metrics[f"{key}_total"] / metrics[f"{key}_count"]
+                lines.append(f"{key}: avg {average:.0f}, max {metrics[f'{key}_max']:.0f}")
+
+        return "\n".join(lines)
@@ -0,0 +1,30 @@
+"""Export Manager."""
+
+import os
+
+import xbmcvfs
+
+from lib.providers import get_provider
+from lib.utils.kodi import get_addon_info
+from lib.utils.m3u import export_m3u
+from lib.utils.xmltv import export_xmltv
+
+_M3U_FILENAME = "channels.m3u8"
+_XMLTV_FILENAME = "epg.xml.gz"
+
+
+class ExportManager:
+    """Export channels and EPG to files readable by PVR clients."""
+
+    def __init__(self):
+        """Initialize Export Manager object."""
+        self.provider = get_provider()
+        self.folder = xbmcvfs.translatePath(get_addon_info("profile"))
+
+    def export_m3u(self) -> None:
+        """Write M3U8 channel playlist into the addon profile folder."""
+        export_m3u(os.path.join(self.folder, _M3U_FILENAME), self.provider.get_streams())
+
+    def export_xmltv(self) -> None:
+        """Write gzipped XMLTV EPG into the addon profile folder."""
+        export_xmltv(os.path.join(self.folder, _XMLTV_FILENAME), self.provider.get_streams(), self.provider.iter_epg())
@@ -2,10 +2,15 @@
 
 import json
 import socket
-from typing import Any, Callable
+from threading import Thread
+from typing import Any, Callable, Iterator
 
 from lib.providers import get_provider
+from lib.utils.artwork import ArtworkCache, is_artwork_cache_enabled
 from lib.utils.cache import use_cache
+from lib.utils.epg import to_json
+
+_STREAMS_CACHE_TTL = 60 * 60
 
 
 class IPTVManager:
@@ -17,26 +22,49 @@ class IPTVManager:
         self.provider = get_provider()
 
     def via_socket(func: Callable[[Any], Any]):
-        """Send the output of the wrapped function to socket."""
+        """Send the output of the wrapped function to socket, either a dict or the pieces of an encoded JSON string."""
 
         def send(self) -> None:
             """Decorate to send over a socket."""
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.connect(("127.0.0.1", self.port))
             try:
-                sock.sendall(json.dumps(func(self)).encode())
+                output = func(self)
+                chunks = [json.dumps(output)] if isinstance(output, dict) else output
+
+                with sock.makefile("wb") as stream:
+                    for chunk in chunks:
+                        stream.write(chunk.encode())
             finally:
                 sock.close()
 
         return send
 
     @via_socket
-    @use_cache("streams.json")
+    @use_cache("streams", ttl=_STREAMS_CACHE_TTL, compress=True, keep=lambda data: len(data["streams"]) > 0)
     def send_channels(self) -> dict:
         """Return JSON-STREAMS formatted python datastructure to IPTV Manager."""
-        return dict(version=1, streams=self.provider.get_streams())
+        streams = self.provider.get_streams()
+
+        if is_artwork_cache_enabled():
+            artwork = ArtworkCache()
+
+            for stream in streams:
+                if stream.get("logo"):
+                    stream["logo"] = artwork.get(stream["logo"])
+
+            # Missing logos are downloaded once channels are sent, and served locally from the next refresh
+            Thread(target=artwork.download_pending, name="iptv-artwork").start()
+
+        return dict(version=1, streams=streams)
 
     @via_socket
-    def send_epg(self) -> dict:
-        """Return JSON-EPG formatted python data structure to IPTV Manager."""
-        return dict(version=1, epg=self.provider.get_epg())
+    def send_epg(self) -> Iterator[str]:
+        """Return JSON-EPG formatted data to IPTV Manager, encoded one channel at a time."""
+        # Only one channel is held as a JSON string at once, the C encoder still doing the work
+        yield '{"version": 1, "epg": {'
+
+        for index, (channel_id, programs) in enumerate(self.provider.get_epg().items()):
+            yield f"{', ' if index > 0 else ''}{json.dumps(channel_id)}: {json.dumps(programs, default=to_json)}"
+
+        yield "}}"
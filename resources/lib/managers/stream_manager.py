@@ -1,5 +1,7 @@
 """Video stream manager."""
 
+from hashlib import sha1
+from time import monotonic, time
 from typing import Callable
 
 import inputstreamhelper
@@ -9,9 +11,12 @@ import xbmcplugin
 from lib.exceptions import AuthenticationRequired, StreamDataDecodeError, StreamNotIncluded
 from lib.providers import get_provider
 from lib.router import router
+from lib.utils.cache import ChunkCache
 from lib.utils.gui import create_play_item
 from lib.utils.kodi import localize, log, ok_dialog
 
+_STREAM_INFO_TTL = 10 * 60
+
 
 class StreamManager:
     """Load video streams using active provider."""
@@ -19,20 +24,25 @@ class StreamManager:
     def __init__(self):
         """Initialize Stream Manager object."""
         self.provider = get_provider()
+        self.cache = ChunkCache("streams")
 
     def load_live_stream(self, stream_id: str) -> None:
         """Load live TV stream."""
-        self._load_stream(self.provider.get_live_stream_info, stream_id=stream_id)
+        self._load_stream("live", self.provider.get_live_stream_info, stream_id=stream_id)
 
     def load_chatchup_stream(self, stream_id: str) -> None:
         """Load catchup TV stream."""
-        self._load_stream(self.provider.get_catchup_stream_info, stream_id=stream_id)
+        self._load_stream("catchup", self.provider.get_catchup_stream_info, stream_id=stream_id)
 
-    def _load_stream(self, stream_getter: Callable[[str], dict], stream_id: str) -> None:
+    def _load_stream(self, stream_type: str, stream_getter: Callable[[str], dict], stream_id: str) -> None:
         """Load stream."""
+        started_at = monotonic()
+        cache_key = sha1(f"{type(self.provider).__name__}/{stream_type}/{stream_id}".encode()).hexdigest()
+
         try:
-            stream_info = stream_getter(stream_id)
+            stream_info = self._get_stream_info(cache_key, stream_getter, stream_id)
         except StreamNotIncluded:
+            self.cache.remove(cache_key)
             log("Stream not included in subscription", xbmc.LOGERROR)
             ok_dialog(localize(30900))
             xbmcplugin.setResolvedUrl(router.handle, False, create_play_item())
@@ -43,11 +53,13 @@ class StreamManager:
             xbmcplugin.setResolvedUrl(router.handle, False, create_play_item())
             return
         except AuthenticationRequired as e:
+            self.cache.retain([])
             log(e, xbmc.LOGERROR)
             ok_dialog(localize(30902))
             xbmcplugin.setResolvedUrl(router.handle, False, create_play_item())
             return
 
+        log(f"Stream info loaded in {(monotonic() - started_at) * 1000:.0f} ms", xbmc.LOGINFO)
         drm = stream_info.get("drm_config", {}).get("license_type")
 
         if drm:
@@ -61,3 +73,25 @@ class StreamManager:
         log("Cannot load InputStream", xbmc.LOGERROR)
         ok_dialog(localize(30901))
         xbmcplugin.setResolvedUrl(router.handle, False, create_play_item())
+
+    def _get_stream_info(self, cache_key: str, stream_getter: Callable[[str], dict], stream_id: str) -> dict:
+        """Return stream info from cache if still valid, or load it using the given stream getter."""
+        cached_stream_info = self.cache.get(cache_key, _STREAM_INFO_TTL)
+
+        if cached_stream_info is not None and cached_stream_info["expires_at"] > time():
+            log("Using cached stream info", xbmc.LOGDEBUG)
+            return cached_stream_info["stream_info"]
+
+        stream_info = stream_getter(stream_id)
+
+        # Stream info embeds session tokens: it can't outlive the session it has been created with
+        expires_at = time() + _STREAM_INFO_TTL
+        session_expires_at = self.provider.get_session_expiry()
+
+        if session_expires_at is not None:
+            expires_at = min(expires_at, session_expires_at)
+
+        # Drop the expired stream infos of other channels and videos, as they hold session tokens
+        self.cache.prune(_STREAM_INFO_TTL)
+        self.cache.set(cache_key, {"expires_at": expires_at, "stream_info": stream_info})
+        return stream_info
@@ -14,16 +14,20 @@ _PROVIDERS = {
     "France.Orange Réunion": OrangeReunionProvider,
 }
 
-_PROVIDER_NAME = get_addon_setting("provider.name")
-_PROVIDER_COUNTRY = get_addon_setting("provider.country")
-_PROVIDER_KEY = f"{_PROVIDER_COUNTRY}.{_PROVIDER_NAME}"
+_PROVIDER = None
 
-_PROVIDER = _PROVIDERS[_PROVIDER_KEY]() if _PROVIDERS.get(_PROVIDER_KEY) is not None else None
 
-if not _PROVIDER:
-    log(f"Cannot instanciate provider: {_PROVIDER_KEY}", xbmc.LOGERROR)
+def get_provider() -> AbstractProvider:
+    """Return the selected provider, instantiating it on first call."""
+    global _PROVIDER
 
+    if _PROVIDER is None:
+        provider_key = f"{get_addon_setting('provider.country')}.{get_addon_setting('provider.name')}"
+
+        if _PROVIDERS.get(provider_key) is None:
+            log(f"Cannot instanciate provider: {provider_key}", xbmc.LOGERROR)
+            return None
+
+        _PROVIDER = _PROVIDERS[provider_key]()
 
-def get_provider() -> AbstractProvider:
-    """Return the selected provider."""
     return _PROVIDER
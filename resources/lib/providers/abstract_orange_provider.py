@@ -4,9 +4,12 @@
 import json
 import re
 from abc import ABC
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
-from time import strptime
-from typing import List
+from hashlib import sha1
+from time import monotonic, strptime
+from typing import Callable, Iterator, List, Tuple, Union
 from urllib.parse import urlencode
 
 import xbmc
@@ -15,10 +18,14 @@ from requests.exceptions import JSONDecodeError, RequestException
 
 from lib.exceptions import AuthenticationRequired, StreamDataDecodeError, StreamNotIncluded, StreamRequestException
 from lib.providers.abstract_provider import AbstractProvider
-from lib.utils.kodi import build_addon_url, get_addon_setting, get_drm, get_global_setting, log, set_addon_setting
+from lib.utils.cache import ChunkCache
+from lib.utils.epg import EPGProgram, EPGWindowSizer
+from lib.utils.kodi import build_addon_url, get_addon_setting, get_drm, get_global_setting, log
+from lib.utils.metrics import register_endpoint_templates
 from lib.utils.request import get_random_ua, request, request_json
+from lib.utils.token_store import TokenStore
 
-_PROGRAMS_ENDPOINT = "https://rp-ott-mediation-tv.woopic.com/api-gw/live/v3/applications/STB4PC/programs?period={period}&epgIds=all&mco={mco}"
+_PROGRAMS_ENDPOINT = "https://rp-ott-mediation-tv.woopic.com/api-gw/live/v3/applications/STB4PC/programs?period={period}&epgIds={epg_ids}&mco={mco}"
 _CATCHUP_CHANNELS_ENDPOINT = "https://rp-ott-mediation-tv.woopic.com/api-gw/catchup/v4/applications/PC/channels"
 _CATCHUP_ARTICLES_ENDPOINT = "https://rp-ott-mediation-tv.woopic.com/api-gw/catchup/v4/applications/PC/channels/{channel_id}/categories/{category_id}"
 _CATCHUP_VIDEOS_ENDPOINT = "https://rp-ott-mediation-tv.woopic.com/api-gw/catchup/v4/applications/PC/groups/{group_id}"
@@ -33,14 +40,58 @@ _LOGIN_URL = "https://login.orange.fr"
 
 _LICENSE_ENDPOINT = "https://mediation-tv.orange.fr/all/api-gw/license/v1/auth/accountToken"
 
+_CHANNELS_MAX_AGE = 60 * 60
+_CATCHUP_CHANNELS_MAX_AGE = 60 * 60
+_CATCHUP_CATEGORIES_MAX_AGE = 15 * 60
+_CATCHUP_ITEMS_MAX_AGE = 5 * 60
+
+_EPG_CACHE_NEAR_FUTURE = 24 * 60 * 60
+_EPG_CACHE_NEAR_FUTURE_TTL = 60 * 60
+_EPG_CACHE_FAR_FUTURE_TTL = 12 * 60 * 60
+_EPG_MIN_SPLIT_PERIOD = 60 * 60 * 1000
+_EPG_IDS_MAX_LENGTH = 3500
+
+register_endpoint_templates(
+    _PROGRAMS_ENDPOINT,
+    _CATCHUP_CHANNELS_ENDPOINT,
+    f"{_CATCHUP_CHANNELS_ENDPOINT}/{{channel_id}}",
+    _CATCHUP_ARTICLES_ENDPOINT,
+    _CATCHUP_VIDEOS_ENDPOINT,
+    _CHANNELS_ENDPOINT,
+    _LIVE_STREAM_ENDPOINT,
+    _CATCHUP_STREAM_ENDPOINT,
+    _STREAM_LOGO_URL,
+)
+
 
 class AbstractOrangeProvider(AbstractProvider, ABC):
     """Abstract Orange Provider."""
 
-    chunks_per_day = 2
+    epg_window_hours = 12
     mco = "OFR"
     groups = {}
 
+    _groups_index = None
+
+    def refresh_session(self, margin: int = 0) -> bool:
+        """Renew session data when it expires within the next margin seconds."""
+        tv_token = self._get_token_store().load().get("tv_token")
+        session_data = self._get_session_data(datetime.now(timezone.utc), margin=margin)
+        return session_data.get("tv_token") != tv_token
+
+    def get_session_expiry(self) -> float:
+        """Return the timestamp at which the stored session expires."""
+        session_data = self._get_token_store().load()
+
+        if not session_data.get("tv_token_expires") or not session_data.get("wassup_expires"):
+            return None
+
+        return min(session_data["tv_token_expires"], session_data["wassup_expires"])
+
+    def get_session_last_used(self) -> float:
+        """Return the timestamp at which the stored session was last used to load a stream."""
+        return self._get_token_store().get_last_used()
+
     def get_live_stream_info(self, stream_id: str) -> dict:
         """Get live stream info."""
         return self._get_stream_info(_LIVE_STREAM_ENDPOINT, stream_id)
@@ -50,93 +101,96 @@ class AbstractOrangeProvider(AbstractProvider, ABC):
         return self._get_stream_info(_CATCHUP_STREAM_ENDPOINT, stream_id)
 
     def get_streams(self) -> list:
-        """Load stream data from Orange and convert it to JSON-STREAMS format."""
-        # @todo: use new API to check if channel is part of subscription
-        channels = request_json(_CHANNELS_ENDPOINT, default={"channels": {}})["channels"]
-        channels.sort(key=lambda channel: channel["displayOrder"])
+        """Load stream data from Orange and convert it to JSON-STREAMS format, keeping the selected groups only."""
+        return self._filter_streams(self._get_channel_catalog()["streams"])
 
-        log(f"{len(channels)} channels found", xbmc.LOGINFO)
+    def get_epg(self) -> dict:
+        """Load EPG data from Orange and convert it to JSON-EPG format, programs being compact EPG records."""
+        epg = {}
 
-        return [
-            {
-                "id": str(channel["idEPG"]),
-                "name": channel["name"],
-                "preset": str(channel["displayOrder"]),
-                "logo": self._extract_logo(channel["logos"]),
-                "stream": build_addon_url(f"/stream/live/{self._get_channel_live_id(channel)}"),
-                "group": [group_name for group_name in self.groups if int(channel["idEPG"]) in self.groups[group_name]],
-            }
-            for channel in channels
-        ]
+        for channel_id, program in self.iter_epg():
+            if channel_id not in epg:
+                epg[channel_id] = []
 
-    def get_epg(self) -> dict:
-        """Load EPG data from Orange and convert it to JSON-EPG format."""
+            epg[channel_id].append(program)
+
+        return epg
+
+    def iter_epg(self) -> Iterator[Tuple[str, EPGProgram]]:
+        """Yield channel ids along with their compact EPG records, as soon as programs are loaded from Orange."""
         past_days_to_display = get_global_setting("epg.pastdaystodisplay", int)
         future_days_to_display = get_global_setting("epg.futuredaystodisplay", int)
 
         start_day = datetime.combine(date.today() - timedelta(days=past_days_to_display), datetime.min.time())
         days_to_display = past_days_to_display + future_days_to_display
 
-        programs = self._get_programs(start_day, days_to_display, self.chunks_per_day, self.mco)
-        log(f"{len(programs)} EPG entries found", xbmc.LOGINFO)
+        # Window size starts from the one chosen during the previous refresh
+        windows_cache = ChunkCache("windows")
+        windows_cache_key = type(self).__name__
+        sizer = EPGWindowSizer(
+            **(windows_cache.get(windows_cache_key, float("inf")) or {"hours": self.epg_window_hours})
+        )
 
-        epg = {}
+        catalog_streams = self._get_channel_catalog()["streams"]
+        streams = self._filter_streams(catalog_streams)
 
-        for program in programs:
-            if program["channelId"] not in epg:
-                epg[program["channelId"]] = []
+        if len(catalog_streams) > 0 and len(streams) == 0:
+            log("No channel in the selected groups: skipping EPG", xbmc.LOGWARNING)
+            return
 
-            if program["programType"] != "EPISODE":
-                title = program["title"]
-                subtitle = None
-                episode = None
-            else:
-                title = program["season"]["serie"]["title"]
-                subtitle = program["title"]
-                season_number = program["season"]["number"]
-                episode_number = program.get("episodeNumber", None)
-                episode = f"S{season_number}E{episode_number}"
-
-            image = None
-            if isinstance(program["covers"], list):
-                for cover in program["covers"]:
-                    if cover["format"] == "RATIO_16_9":
-                        image = program["covers"][0]["url"]
-
-            start = datetime.fromtimestamp(program["diffusionDate"]).astimezone().replace(microsecond=0).isoformat()
-            stop = datetime.fromtimestamp(program["diffusionDate"] + program["duration"]).astimezone().isoformat()
-
-            epg[program["channelId"]].append(
-                {
-                    "start": start,
-                    "stop": stop,
-                    "title": title,
-                    "subtitle": subtitle,
-                    "episode": episode,
-                    "description": program["synopsis"],
-                    "genre": program["genre"] if program["genreDetailed"] is None else program["genreDetailed"],
-                    "image": image,
-                }
-            )
+        epg_ids_batches = self._get_epg_ids_batches([stream["id"] for stream in streams])
+        programs_count = 0
 
-        return epg
+        for program in self._get_programs(start_day, days_to_display, sizer, epg_ids_batches, self.mco):
+            yield program["channelId"], self._format_program(program)
+            programs_count += 1
+
+        log(f"{programs_count} EPG entries found", xbmc.LOGINFO)
+
+        windows_cache.set(windows_cache_key, sizer.to_dict())
+        log(f"EPG window: {sizer.hours} h, next refresh: {sizer.get_next_hours()} h", xbmc.LOGDEBUG)
 
     def get_catchup_items(self, levels: List[str]) -> list:
         """Return a list of directory items for the specified levels."""
+        url, default, max_age, formatter = self._get_catchup_request(levels)
+        return formatter(request_json(url, default=default, max_age=max_age), *levels)
+
+    def prefetch_catchup_items(self, levels_list: List[List[str]]) -> None:
+        """Load catchup responses of the specified levels concurrently, so that they are served from cache next."""
+        started_at = monotonic()
+        max_workers = max(1, get_addon_setting("network.pool_size", int))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self._load_catchup_response, levels_list))
+
+        elapsed_ms = (monotonic() - started_at) * 1000
+        log(f"{len(levels_list)} catchup levels prefetched in {elapsed_ms:.0f} ms", xbmc.LOGDEBUG)
+
+    def _load_catchup_response(self, levels: List[str]) -> None:
+        """Load catchup response of the specified levels into the response cache."""
+        url, default, max_age, _ = self._get_catchup_request(levels)
+        request_json(url, default=default, max_age=max_age)
+
+    def _get_catchup_request(self, levels: List[str]) -> Tuple[str, Union[dict, list], int, Callable]:
+        """Return url, default response, cache max age and item formatter of the request for the specified levels."""
         depth = len(levels)
-        item_getters = [
-            self._get_catchup_channels,
-            self._get_catchup_categories,
-            self._get_catchup_articles,
-            self._get_catchup_videos,
-        ]
 
-        return item_getters[depth](*levels)
+        if depth == 0:
+            return _CATCHUP_CHANNELS_ENDPOINT, [], _CATCHUP_CHANNELS_MAX_AGE, self._format_catchup_channels
 
-    def _get_catchup_channels(self) -> list:
-        """Load available catchup channels."""
-        channels = request_json(_CATCHUP_CHANNELS_ENDPOINT, default=[])
+        if depth == 1:
+            url = f"{_CATCHUP_CHANNELS_ENDPOINT}/{levels[0]}"
+            return url, {"categories": {}}, _CATCHUP_CATEGORIES_MAX_AGE, self._format_catchup_categories
 
+        if depth == 2:
+            url = _CATCHUP_ARTICLES_ENDPOINT.format(channel_id=levels[0], category_id=levels[1])
+            return url, {"articles": {}}, _CATCHUP_ITEMS_MAX_AGE, self._format_catchup_articles
+
+        url = _CATCHUP_VIDEOS_ENDPOINT.format(group_id=levels[2])
+        return url, {"videos": {}}, _CATCHUP_ITEMS_MAX_AGE, self._format_catchup_videos
+
+    def _format_catchup_channels(self, channels: list) -> list:
+        """Format available catchup channels."""
         return [
             {
                 "is_folder": True,
@@ -147,25 +201,19 @@ class AbstractOrangeProvider(AbstractProvider, ABC):
             for channel in channels
         ]
 
-    def _get_catchup_categories(self, channel_id: str) -> list:
-        """Return a list of catchup categories for the specified channel id."""
-        url = f"{_CATCHUP_CHANNELS_ENDPOINT}/{channel_id}"
-        categories = request_json(url, default={"categories": {}})["categories"]
-
+    def _format_catchup_categories(self, data: dict, channel_id: str) -> list:
+        """Format catchup categories for the specified channel id."""
         return [
             {
                 "is_folder": True,
                 "label": category["name"][0].upper() + category["name"][1:],
                 "path": build_addon_url(f"/catchup/{channel_id}/{category['id']}"),
             }
-            for category in categories
+            for category in data["categories"]
         ]
 
-    def _get_catchup_articles(self, channel_id: str, category_id: str) -> list:
-        """Return a list of catchup groups for the specified channel id and category id."""
-        url = _CATCHUP_ARTICLES_ENDPOINT.format(channel_id=channel_id, category_id=category_id)
-        articles = request_json(url, default={"articles": {}})["articles"]
-
+    def _format_catchup_articles(self, data: dict, channel_id: str, category_id: str) -> list:
+        """Format catchup groups for the specified channel id and category id."""
         return [
             {
                 "is_folder": True,
@@ -173,14 +221,11 @@ class AbstractOrangeProvider(AbstractProvider, ABC):
                 "path": build_addon_url(f"/catchup/{channel_id}/{category_id}/{article['id']}"),
                 "art": {"poster": article["covers"]["ref_16_9"]},
             }
-            for article in articles
+            for article in data["articles"]
         ]
 
-    def _get_catchup_videos(self, channel_id: str, category_id: str, article_id: str) -> list:
-        """Return a list of catchup videos for the specified channel id and article id."""
-        url = _CATCHUP_VIDEOS_ENDPOINT.format(group_id=article_id)
-        videos = request_json(url, default={"videos": {}})["videos"]
-
+    def _format_catchup_videos(self, data: dict, channel_id: str, category_id: str, article_id: str) -> list:
+        """Format catchup videos for the specified channel id and article id."""
         return [
             {
                 "is_folder": False,
@@ -195,15 +240,58 @@ class AbstractOrangeProvider(AbstractProvider, ABC):
                     "year": int(video["productionDate"]),
                 },
             }
-            for video in videos
+            for video in data["videos"]
         ]
 
     def _get_stream_info(self, stream_endpoint: str, stream_id: str) -> dict:
         """Load stream info from Orange."""
         stream_endpoint_url = stream_endpoint.format(stream_id=stream_id)
         now = datetime.now(timezone.utc)
-        session_data = get_addon_setting("provider.session_data", dict)
+        session_data = self._get_session_data(now)
+
+        try:
+            stream_info = self._request_stream_info(stream_endpoint_url, session_data)
+        except StreamRequestException:
+            log("Stored session data rejected: initiating new session", xbmc.LOGDEBUG)
+            session_data = self._get_session_data(now, rejected_tv_token=session_data.get("tv_token"))
+            stream_info = self._request_stream_info(stream_endpoint_url, session_data)
+
+        self._get_token_store().mark_used()
+        return stream_info
+
+    def _get_session_data(self, now: datetime, margin: int = 0, rejected_tv_token: str = None) -> dict:
+        """Return session data valid for the next margin seconds, initiating a new session when needed.
+
+        Only one process initiates the new session at a time: the others wait for the token store lock, then reuse the
+        session data it holds if they are valid.
+        """
+        store = self._get_token_store()
+        at = now + timedelta(seconds=margin)
+        session_data = store.load()
+
+        if self._is_session_data_valid(session_data, at) and session_data.get("tv_token") != rejected_tv_token:
+            return session_data
+
+        with store.lock():
+            session_data = store.load()
+
+            if self._is_session_data_valid(session_data, at) and session_data.get("tv_token") != rejected_tv_token:
+                log("Using session data renewed by another process", xbmc.LOGDEBUG)
+                return session_data
+
+            started_at = monotonic()
+            session_data = self._init_session_data(now)
+            store.save(session_data)
+            log(f"Session data renewed in {(monotonic() - started_at) * 1000:.0f} ms", xbmc.LOGINFO)
+
+        return session_data
+
+    def _get_token_store(self) -> TokenStore:
+        """Return the token store of the provider."""
+        return TokenStore(type(self).__name__)
 
+    def _init_session_data(self, now: datetime) -> dict:
+        """Initiate a new session with Orange, login first when credentials are provided."""
         session = Session()
         session.headers = {
             "Accept": "application/xhtml+xml,application/xml",
@@ -211,24 +299,10 @@ class AbstractOrangeProvider(AbstractProvider, ABC):
             "User-Agent": get_random_ua(),
         }
 
-        if self._is_session_data_valid(session_data, now):
-            try:
-                stream_info = self._request_stream_info(stream_endpoint_url, session_data)
-            except StreamRequestException:
-                if get_addon_setting("provider.use_credentials", bool):
-                    self._login(session)
-
-                session_data = self._refresh_session_data(session, now)
-                stream_info = self._request_stream_info(stream_endpoint_url, session_data)
-            return stream_info
-
         if get_addon_setting("provider.use_credentials", bool):
             self._login(session)
 
-        session_data = self._refresh_session_data(session, now)
-        stream_info = self._request_stream_info(stream_endpoint_url, session_data)
-
-        return stream_info
+        return self._refresh_session_data(session, now)
 
     def _is_session_data_valid(self, session_data: dict, at: datetime = None) -> bool:
         """Check if session data is valid."""
@@ -241,13 +315,16 @@ class AbstractOrangeProvider(AbstractProvider, ABC):
         if not session_data.get("tv_token_expires") or at.timestamp() > session_data.get("tv_token_expires"):
             return False
 
+        return session_data.get("wassup_expires") is not None and at.timestamp() < session_data["wassup_expires"]
+
+    def _parse_wassup_expiry(self, wassup: str) -> float:
+        """Return the timestamp at which wassup cookie expires, None if it cannot be found."""
         try:
-            decoded_wassup = bytes.fromhex(session_data.get("wassup")).decode()
+            decoded_wassup = bytes.fromhex(wassup).decode()
             xwvd = re.search("\|X_WASSUP_VALID_DATE=(.*?)\|", decoded_wassup).group(1)
-            wassup_expires_at = datetime(*(strptime(xwvd, "%Y%m%d%H%M%S")[0:6])).replace(tzinfo=timezone.utc)
-            return wassup_expires_at > at
-        except (TypeError, AttributeError):
-            return False
+            return datetime(*(strptime(xwvd, "%Y%m%d%H%M%S")[0:6])).replace(tzinfo=timezone.utc).timestamp()
+        except (TypeError, ValueError, AttributeError):
+            return None
 
     def _refresh_session_data(self, session: Session, now: datetime) -> dict:
         """Fetch session data from home page."""
@@ -258,6 +335,7 @@ class AbstractOrangeProvider(AbstractProvider, ABC):
                 "tv_token_expires": now.timestamp() + 30 * 60,
                 "wassup": session.cookies.get("wassup"),
             }
+            session_data["wassup_expires"] = self._parse_wassup_expiry(session_data["wassup"])
         except RequestException as e:
             raise AuthenticationRequired("Cannot initiate new session (request failed)") from e
         except AttributeError as e:
@@ -265,7 +343,6 @@ class AbstractOrangeProvider(AbstractProvider, ABC):
         except JSONDecodeError as e:
             raise StreamDataDecodeError("Cannot initiate new session (tv token not loaded") from e
 
-        set_addon_setting("provider.session_data", dict(session_data))
         return session_data
 
     def _request_stream_info(self, stream_endpoint_url: str, session_data: dict) -> dict:
@@ -349,6 +426,66 @@ class AbstractOrangeProvider(AbstractProvider, ABC):
         if "wassup" not in session.cookies:
             log("Error while authenticating (wassup not found)", xbmc.LOGWARNING)
 
+    def _get_channel_catalog(self) -> dict:
+        """Return channel catalog holding JSON-STREAMS formatted channels."""
+        return ChunkCache("catalog").get_or_fetch(
+            type(self).__name__,
+            _CHANNELS_MAX_AGE,
+            self._build_channel_catalog,
+            lambda catalog: len(catalog["streams"]) > 0,
+        )
+
+    def _build_channel_catalog(self) -> dict:
+        """Load channels from Orange and build channel catalog."""
+        # @todo: use new API to check if channel is part of subscription
+        channels = request_json(_CHANNELS_ENDPOINT, default={"channels": []}, max_age=_CHANNELS_MAX_AGE)["channels"]
+        channels.sort(key=lambda channel: channel["displayOrder"])
+
+        log(f"{len(channels)} channels found", xbmc.LOGINFO)
+
+        groups_index = self._get_groups_index()
+        catalog = {"streams": []}
+
+        for channel in channels:
+            epg_id = str(channel["idEPG"])
+            live_id = self._get_channel_live_id(channel)
+
+            catalog["streams"].append(
+                {
+                    "id": epg_id,
+                    "name": channel["name"],
+                    "preset": str(channel["displayOrder"]),
+                    "logo": self._extract_logo(channel["logos"]),
+                    "stream": build_addon_url(f"/stream/live/{live_id}"),
+                    "group": groups_index.get(int(channel["idEPG"]), []),
+                }
+            )
+
+        return catalog
+
+    def _filter_streams(self, streams: list) -> list:
+        """Keep the streams belonging to the channel groups selected in settings, all of them if none is selected."""
+        selected_groups = {group.strip().casefold() for group in get_addon_setting("iptv.groups").split(",")} - {""}
+
+        if len(selected_groups) == 0:
+            return streams
+
+        return [stream for stream in streams if selected_groups & {group.casefold() for group in stream["group"]}]
+
+    def _get_groups_index(self) -> dict:
+        """Return group names indexed by channel EPG id."""
+        if self._groups_index is None:
+            self._groups_index = {}
+
+            for group_name, epg_ids in self.groups.items():
+                for epg_id in epg_ids:
+                    channel_groups = self._groups_index.setdefault(epg_id, [])
+
+                    if group_name not in channel_groups:
+                        channel_groups.append(group_name)
+
+        return self._groups_index
+
     def _get_channel_live_id(self, channel: dict) -> str:
         """Get live id for given channel."""
         return channel["technicalChannels"]["live"][0]["liveTargetURLRelativePath"]
@@ -360,22 +497,256 @@ class AbstractOrangeProvider(AbstractProvider, ABC):
 
         return None
 
-    def _get_programs(self, start_day: datetime, days_to_display: int, chunks_per_day: int, mco: str = "OFR") -> list:
-        """Return the programs for today (default) or the specified period."""
-        programs = []
-        start_day_timestamp = start_day.timestamp()
-        chunk_duration = 24 * 60 * 60 / chunks_per_day
+    def _format_program(self, program: dict) -> EPGProgram:
+        """Convert program data from Orange to a compact EPG record."""
+        if program["programType"] != "EPISODE":
+            title = program["title"]
+            subtitle = None
+            episode = None
+        else:
+            title = program["season"]["serie"]["title"]
+            subtitle = program["title"]
+            season_number = program["season"]["number"]
+            episode_number = program.get("episodeNumber")
+            episode = f"S{season_number}E{episode_number}"
+
+        image = None
+        if isinstance(program["covers"], list):
+            for cover in program["covers"]:
+                if cover["format"] == "RATIO_16_9":
+                    image = program["covers"][0]["url"]
+
+        return EPGProgram(
+            start=program["diffusionDate"],
+            stop=program["diffusionDate"] + program["duration"],
+            title=title,
+            subtitle=subtitle,
+            episode=episode,
+            description=program["synopsis"],
+            genre=program["genre"] if program["genreDetailed"] is None else program["genreDetailed"],
+            image=image,
+        )
+
+    def _get_programs(
+        self,
+        start_day: datetime,
+        days_to_display: int,
+        sizer: EPGWindowSizer,
+        epg_ids_batches: List[str],
+        mco: str = "OFR",
+    ) -> Iterator[dict]:
+        """Yield the programs for today (default) or the specified period, chunk by chunk.
+
+        Programs returned by two consecutive chunks are only yielded once, programs outside of the period are dropped.
+        """
+        periods = self._get_programs_periods(start_day, days_to_display, sizer, epg_ids_batches, mco)
+
+        if not periods:
+            return
+
+        window_start, window_end = periods[0][0] / 1000, periods[-1][1] / 1000
+        duplicates_count, clipped_count = 0, 0
+
+        # Diffusion dates of the programs overlapping the next chunk, by channel: only those can be returned twice
+        overlapping = {}
+
+        for period_start, period_end, programs in self._load_programs_chunks(periods, sizer, epg_ids_batches, mco):
+            next_overlapping = {}
+
+            for program in programs:
+                program_start = program["diffusionDate"]
+                program_end = program_start + program["duration"]
+
+                if program_end <= window_start or program_start >= window_end:
+                    clipped_count += 1
+                    continue
+
+                if program_end > period_end / 1000:
+                    next_overlapping.setdefault(program["channelId"], set()).add(program_start)
+
+                if program_start < period_start / 1000 and program_start in overlapping.get(program["channelId"], ()):
+                    duplicates_count += 1
+                    continue
+
+                yield program
+
+            overlapping = next_overlapping
+
+        log(f"EPG entries removed: {duplicates_count} duplicates, {clipped_count} out of period", xbmc.LOGINFO)
 
-        for chunk in range(0, days_to_display * chunks_per_day):
-            period_start = (start_day_timestamp + chunk_duration * chunk) * 1000
-            period_end = (start_day_timestamp + chunk_duration * (chunk + 1)) * 1000
+    def _get_programs_periods(
+        self, start_day: datetime, days_to_display: int, sizer: EPGWindowSizer, epg_ids_batches: List[str], mco: str
+    ) -> List[Tuple[int, int]]:
+        """Split the displayed days into contiguous periods of the current window size.
+
+        Periods still validly cached with another window size are kept as they are, so that a window size change does
+        not discard them: only the periods missing from cache follow the new size.
+        """
+        cache = ChunkCache("epg")
+        now = datetime.now(timezone.utc).timestamp()
+        window_start = int(start_day.timestamp() * 1000)
+        window_end = window_start + days_to_display * 24 * 60 * 60 * 1000
+        chunk_duration = sizer.hours * 60 * 60 * 1000
+
+        key_prefix = self._get_programs_chunk_key_prefix(epg_ids_batches, mco)
+        cached_periods = {}
+
+        for key in cache.list_keys():
+            if not key.startswith(key_prefix):
+                continue
 
             try:
-                period = f"{int(period_start)},{int(period_end)}"
+                period_start, period_end = (int(value) for value in key[len(key_prefix) :].split("_"))
             except ValueError:
-                period = "today"
+                continue
+
+            if not window_start <= period_start < period_end <= window_end:
+                continue
+
+            age = cache.get_age(key)
+
+            if age is not None and age <= self._get_programs_chunk_max_age(period_start, period_end, now):
+                cached_periods[period_start] = max(period_end, cached_periods.get(period_start, period_end))
+
+        periods = []
+        period_start = window_start
 
-            url = _PROGRAMS_ENDPOINT.format(period=period, mco=mco)
-            programs.extend(request_json(url, default=[]))
+        while period_start < window_end:
+            period_end = cached_periods.get(period_start)
+
+            if period_end is None:
+                # Next boundary of the current window size, unless a cached period starts before it
+                period_end = window_start + ((period_start - window_start) // chunk_duration + 1) * chunk_duration
+                period_end = min([period_end, window_end, *(start for start in cached_periods if start > period_start)])
+
+            periods.append((period_start, period_end))
+            period_start = period_end
+
+        return periods
+
+    def _get_epg_ids_batches(self, epg_ids: List[str]) -> List[str]:
+        """Split EPG ids into comma separated batches short enough to fit in request URLs."""
+        batches = []
+
+        for epg_id in sorted(set(epg_ids), key=int):
+            if batches and len(batches[-1]) + len(epg_id) < _EPG_IDS_MAX_LENGTH:
+                batches[-1] += f",{epg_id}"
+            else:
+                batches.append(epg_id)
+
+        # Channel list could not be loaded: request all channels as before
+        return batches or ["all"]
+
+    def _load_programs_chunks(
+        self, periods: List[Tuple[int, int]], sizer: EPGWindowSizer, epg_ids_batches: List[str], mco: str
+    ) -> Iterator[Tuple[int, int, list]]:
+        """Yield the programs of each period in order, loading several periods at once."""
+        cache = ChunkCache("epg")
+        cache.retain([self._get_programs_chunk_key(start, end, epg_ids_batches, mco) for start, end in periods])
+        now = datetime.now(timezone.utc).timestamp()
+
+        max_workers = max(1, get_addon_setting("iptv.epg_max_workers", int))
+        log(f"Loading {len(periods)} EPG chunks using {max_workers} workers", xbmc.LOGDEBUG)
+
+        # Only keep max_workers chunks in flight so that memory stays bounded whatever the window size
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = deque()
+
+            for period_start, period_end in periods:
+                future = executor.submit(
+                    self._get_programs_chunk, cache, period_start, period_end, sizer, epg_ids_batches, mco, now
+                )
+                futures.append((period_start, period_end, future))
+
+                if len(futures) >= max_workers:
+                    period_start, period_end, future = futures.popleft()
+                    yield period_start, period_end, future.result()
+
+            while futures:
+                period_start, period_end, future = futures.popleft()
+                yield period_start, period_end, future.result()
+
+        log(f"EPG cache: {cache.hits} hits, {cache.misses} misses", xbmc.LOGINFO)
+
+    def _get_programs_chunk_key(self, period_start: int, period_end: int, epg_ids_batches: List[str], mco: str) -> str:
+        """Return cache key of the programs of the specified period, for the specified channels."""
+        return f"{self._get_programs_chunk_key_prefix(epg_ids_batches, mco)}{period_start}_{period_end}"
+
+    def _get_programs_chunk_key_prefix(self, epg_ids_batches: List[str], mco: str) -> str:
+        """Return cache key prefix shared by the programs of every period, for the specified channels."""
+        epg_ids_hash = sha1(";".join(epg_ids_batches).encode("utf-8")).hexdigest()[:8]
+        return f"{mco}_{epg_ids_hash}_"
+
+    def _get_programs_chunk_max_age(self, period_start: int, period_end: int, now: float) -> float:
+        """Return how long the programs of the specified period stay valid once cached."""
+        if period_end / 1000 <= now:
+            # Past chunks never change once they have been loaded after their end
+            return now - period_end / 1000
+
+        if period_start / 1000 - now < _EPG_CACHE_NEAR_FUTURE:
+            return _EPG_CACHE_NEAR_FUTURE_TTL
+
+        return _EPG_CACHE_FAR_FUTURE_TTL
+
+    def _get_programs_chunk(
+        self,
+        cache: ChunkCache,
+        period_start: int,
+        period_end: int,
+        sizer: EPGWindowSizer,
+        epg_ids_batches: List[str],
+        mco: str,
+        now: float,
+    ) -> list:
+        """Return the programs of the specified period, from cache when still valid."""
+        key = self._get_programs_chunk_key(period_start, period_end, epg_ids_batches, mco)
+        max_age = self._get_programs_chunk_max_age(period_start, period_end, now)
+        failed_batches = []
+
+        def fetch() -> list:
+            programs = []
+
+            for epg_ids in epg_ids_batches:
+                batch_programs = self._fetch_programs(period_start, period_end, epg_ids, sizer, mco)
+
+                if batch_programs is None:
+                    failed_batches.append(epg_ids)
+                else:
+                    programs.extend(batch_programs)
+
+            return programs
+
+        # Chunks missing the programs of a failed batch are not cached, so that they are fetched again next time
+        return cache.get_or_fetch(key, max_age, fetch, lambda programs: len(programs) > 0 and not failed_batches)
+
+    def _fetch_programs(
+        self, period_start: int, period_end: int, epg_ids: str, sizer: EPGWindowSizer, mco: str, split: bool = True
+    ) -> list:
+        """Fetch the programs of the specified period, loading its two halves instead when the request fails.
+
+        Return None when programs could not be loaded.
+        """
+        url = _PROGRAMS_ENDPOINT.format(period=f"{period_start},{period_end}", epg_ids=epg_ids, mco=mco)
+        started_at = monotonic()
+        programs = request_json(url)
+        sizer.record(monotonic() - started_at, len(programs or []), failed=programs is None)
+
+        if programs is not None or not split or period_end - period_start <= _EPG_MIN_SPLIT_PERIOD:
+            return programs
+
+        log("EPG request failed: loading period in two halves", xbmc.LOGDEBUG)
+        period_middle = (period_start + period_end) // 2
+        programs = self._fetch_programs(period_start, period_middle, epg_ids, sizer, mco, split=False)
+        second_half_programs = self._fetch_programs(period_middle, period_end, epg_ids, sizer, mco, split=False)
+
+        if programs is None or second_half_programs is None:
+            return None
+
+        program_keys = {(program["channelId"], program["diffusionDate"]) for program in programs}
+
+        # Programs running at the middle of the period are returned by both halves
+        for program in second_half_programs:
+            if (program["channelId"], program["diffusionDate"]) not in program_keys:
+                programs.append(program)
 
         return programs
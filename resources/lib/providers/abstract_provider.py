@@ -1,12 +1,34 @@
 """Abstract TV Provider."""
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Iterator, List, Tuple
 
 
 class AbstractProvider(ABC):
     """Provide methods to be implemented by each ISP."""
 
+    def refresh_session(self, margin: int = 0) -> bool:
+        """Renew provider session when it expires within the next margin seconds. Return True when renewed."""
+        return False
+
+    def iter_epg(self) -> Iterator[Tuple[str, Any]]:
+        """Yield channel ids along with their programs, one program at a time. Default implementation uses get_epg."""
+        for channel_id, programs in (self.get_epg() or {}).items():
+            for program in programs:
+                yield channel_id, program
+
+    def get_session_expiry(self) -> float:
+        """Return the timestamp at which the current provider session expires, or None if there is no session."""
+        return None
+
+    def get_session_last_used(self) -> float:
+        """Return the timestamp at which the provider session was last used to load a stream, or None if never."""
+        return None
+
+    def prefetch_catchup_items(self, levels_list: List[List[str]]) -> None:
+        """Load directory items of the specified levels ahead of navigation. Default implementation does nothing."""
+        return None
+
     @abstractmethod
     def get_live_stream_info(self, stream_id: str) -> dict:
         """Get live stream information (MPD address, Widewine key) for the specified id. Returned keys: path, mime_type, manifest_type, drm, license_type, license_key."""  # noqa: E501
@@ -24,7 +46,7 @@ class AbstractProvider(ABC):
 
     @abstractmethod
     def get_epg(self) -> dict:
-        """Return EPG data for the specified period following JSON-EPG format."""
+        """Return EPG data for the specified period following JSON-EPG format (programs may be EPGProgram records)."""
         pass
 
     @abstractmethod
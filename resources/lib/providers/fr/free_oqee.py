@@ -10,6 +10,7 @@ from requests.exceptions import RequestException
 from lib.exceptions import AuthenticationRequired
 from lib.providers.abstract_provider import AbstractProvider
 from lib.utils.kodi import build_addon_url, get_drm, log
+from lib.utils.metrics import register_endpoint_templates
 from lib.utils.request import get_random_ua, request, request_json
 
 _SERVICE_PLAN_ENDPOINT = "https://api.oqee.net/api/v5/service_plan"
@@ -17,6 +18,8 @@ _LOGIN_ENDPOINT = "https://api.oqee.net/api/v5/user/login"
 
 _STREAM_LOGO_URL = "https://img1.dc2.oqee.net/channel_pictures/{stream_id}/w200"
 
+register_endpoint_templates(_SERVICE_PLAN_ENDPOINT, _LOGIN_ENDPOINT, _STREAM_LOGO_URL)
+
 
 class FreeOqeeProvider(AbstractProvider):
     """OQEE by Free provider."""
@@ -106,9 +109,9 @@ class FreeOqeeProvider(AbstractProvider):
             for channel in channel_list
         ]
 
-    def get_epg(self) -> list:
+    def get_epg(self) -> dict:
         """Load EPG data from OQEE and convert it to JSON-EPG format."""
-        return []
+        return {}
 
     def get_catchup_items(self, levels: List[str]) -> list:
         """Return a list of directory items for the specified levels."""
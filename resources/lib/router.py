@@ -1,9 +1,12 @@
 """Addon router initialization."""
 
+import sys
+from urllib.parse import urlsplit
+
 import xbmc
 from routing import Plugin as Router
 
-from lib.utils.kodi import log
+from lib.utils.kodi import get_addon_setting, log
 
 router = Router()
 
@@ -11,4 +14,11 @@ router = Router()
 def init_router():
     """Init addon router."""
     log("Initializing addon router", xbmc.LOGDEBUG)
+
+    if get_addon_setting("debug.profiling", bool):
+        from lib.utils.profiling import run_with_profiler
+
+        run_with_profiler(router.run, urlsplit(sys.argv[0]).path)
+        return
+
     router.run()
@@ -1,8 +1,10 @@
-"""Addon routes."""
+"""Addon routes.
+
+Managers are imported within routes so that each plugin invocation only loads the code it needs.
+"""
 
 import xbmc
 
-from lib.managers import CatchupManager, IPTVManager, StreamManager
 from lib.router import router
 from lib.utils.kodi import log
 
@@ -10,6 +12,8 @@ from lib.utils.kodi import log
 @router.route("/")
 def index():
     """Display catchup service index."""
+    from lib.managers import CatchupManager
+
     log("Display catchup index", xbmc.LOGINFO)
     CatchupManager().build_directory()
 
@@ -17,6 +21,8 @@ def index():
 @router.route("/catchup/<path:levels>")
 def catchup_directory(levels: str):
     """Display catchup service directory."""
+    from lib.managers import CatchupManager
+
     log(f"Display catchup directory {levels}", xbmc.LOGINFO)
     CatchupManager().build_directory(levels)
 
@@ -24,6 +30,8 @@ def catchup_directory(levels: str):
 @router.route("/stream/live/<stream_id>")
 def stream_live(stream_id: str):
     """Load live stream for the required channel id."""
+    from lib.managers import StreamManager
+
     log(f"Loading live stream {stream_id}", xbmc.LOGINFO)
     StreamManager().load_live_stream(stream_id)
 
@@ -31,6 +39,8 @@ def stream_live(stream_id: str):
 @router.route("/stream/catchup/<stream_id>")
 def stream_catchup(stream_id: str):
     """Load catchup stream for the required video id."""
+    from lib.managers import StreamManager
+
     log(f"Loading catchup stream {stream_id}", xbmc.LOGINFO)
     StreamManager().load_chatchup_stream(stream_id)
 
@@ -38,6 +48,8 @@ def stream_catchup(stream_id: str):
 @router.route("/iptv/channels")
 def iptv_channels():
     """Return JSON-STREAMS formatted data for all live channels."""
+    from lib.managers import IPTVManager
+
     log("Loading channels for IPTV Manager", xbmc.LOGINFO)
     port = int(router.args.get("port")[0])
     IPTVManager(port).send_channels()
@@ -46,6 +58,35 @@ def iptv_channels():
 @router.route("/iptv/epg")
 def iptv_epg():
     """Return JSON-EPG formatted data for all live channel EPG data."""
+    from lib.managers import IPTVManager
+
     log("Loading EPG for IPTV Manager", xbmc.LOGINFO)
     port = int(router.args.get("port")[0])
     IPTVManager(port).send_epg()
+
+
+@router.route("/export/m3u")
+def export_m3u():
+    """Write live channels into an M3U8 playlist."""
+    from lib.managers import ExportManager
+
+    log("Exporting channels to M3U", xbmc.LOGINFO)
+    ExportManager().export_m3u()
+
+
+@router.route("/export/xmltv")
+def export_xmltv():
+    """Write EPG data into a gzipped XMLTV file."""
+    from lib.managers import ExportManager
+
+    log("Exporting EPG to XMLTV", xbmc.LOGINFO)
+    ExportManager().export_xmltv()
+
+
+@router.route("/debug/metrics")
+def debug_metrics():
+    """Display request metrics."""
+    from lib.managers import DebugManager
+
+    log("Display request metrics", xbmc.LOGINFO)
+    DebugManager().build_metrics_directory()
@@ -0,0 +1,106 @@
+"""Artwork cache utils."""
+
+import mimetypes
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from hashlib import sha1
+from threading import Lock
+from time import monotonic
+
+import xbmc
+from requests.exceptions import RequestException
+
+from lib.utils.cache import evict_files, get_cache_folder, write_file_atomically
+from lib.utils.kodi import get_addon_setting, log
+from lib.utils.request import request
+
+_ARTWORK_MAX_SIZE = 50 * 1024 * 1024
+_ARTWORK_EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp"}
+
+
+def is_artwork_cache_enabled() -> bool:
+    """Return whether remote images are cached into the addon profile."""
+    return get_addon_setting("artwork.cache", bool)
+
+
+class ArtworkCache:
+    """Keep local copies of remote images within a byte budget, evicting the least recently used ones."""
+
+    def __init__(self):
+        """Initialize artwork cache, indexing cached images by URL hash."""
+        self.folder = get_cache_folder("artwork")
+        self.pending = {}
+        self._lock = Lock()
+        self._filenames = {
+            os.path.splitext(filename)[0]: filename
+            for filename in os.listdir(self.folder)
+            if not filename.endswith(".tmp")
+        }
+
+    def get(self, url: str) -> str:
+        """Return local path of the image at url when cached, otherwise schedule its download and return url."""
+        if not url or not url.startswith("http"):
+            return url
+
+        key = sha1(url.encode("utf-8")).hexdigest()
+        filename = self._filenames.get(key)
+
+        if filename is None:
+            self.pending[key] = url
+            return url
+
+        filepath = os.path.join(self.folder, filename)
+
+        with suppress(OSError):
+            os.utime(filepath)
+
+        return filepath
+
+    def localize(self, art: dict) -> dict:
+        """Return art dictionary with cached images replaced by their local paths."""
+        return {key: self.get(url) for key, url in art.items()}
+
+    def download_pending(self) -> None:
+        """Download scheduled images concurrently, then evict least recently used images above the byte budget."""
+        if len(self.pending) == 0:
+            return
+
+        started_at = monotonic()
+        max_workers = max(1, get_addon_setting("network.pool_size", int))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            downloaded = sum(executor.map(self._download, self.pending.keys(), self.pending.values()))
+
+        elapsed_ms = (monotonic() - started_at) * 1000
+        log(f"{downloaded}/{len(self.pending)} images downloaded in {elapsed_ms:.0f} ms", xbmc.LOGDEBUG)
+        self.pending = {}
+        self._evict()
+
+    def _download(self, key: str, url: str) -> bool:
+        """Download image at url into the cache folder."""
+        try:
+            res = request("GET", url, headers={"Accept": "image/*"})
+        except RequestException as e:
+            log(f"Cannot download image {url}: {e}", xbmc.LOGDEBUG)
+            return False
+
+        content_type = res.headers.get("Content-Type", "").split(";")[0].strip()
+
+        if not content_type.startswith("image/"):
+            return False
+
+        extension = _ARTWORK_EXTENSIONS.get(content_type) or mimetypes.guess_extension(content_type) or ""
+
+        if not write_file_atomically(os.path.join(self.folder, f"{key}{extension}"), res.content):
+            return False
+
+        with self._lock:
+            self._filenames[key] = f"{key}{extension}"
+
+        return True
+
+    def _evict(self) -> None:
+        """Remove least recently used images above the byte budget."""
+        for filename in evict_files(self.folder, _ARTWORK_MAX_SIZE):
+            self._filenames.pop(os.path.splitext(filename)[0], None)
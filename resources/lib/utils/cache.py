@@ -1,37 +1,277 @@
 """Cache utils."""
 
+import inspect
 import json
 import os
-from typing import Any, Callable
+import zlib
+from contextlib import suppress
+from functools import wraps
+from hashlib import sha1
+from threading import Lock, get_ident
+from time import time
+from typing import Any, Callable, Iterable, List
 
 import xbmc
 import xbmcvfs
 
-from lib.utils.kodi import get_addon_info, log
+from lib.utils.kodi import get_addon_info, get_addon_setting, log
+from lib.utils.lock import FileLock
 
+_CACHE_MAX_SIZE = 20 * 1024 * 1024
 
-def use_cache(filepath: str) -> Callable[[Callable], Callable]:
-    """Use cached data when Exception is raised or update cache on success."""
-    cache_folder = os.path.join(xbmcvfs.translatePath(get_addon_info("profile")), "cache")
+_FETCH_LOCK_TIMEOUT = 30
+_FETCH_LOCK_STALE_AFTER = 60
+
+
+def get_cache_folder(name: str = "") -> str:
+    """Return the path of the cache folder (or of one of its subfolders), creating it if needed."""
+    cache_folder = os.path.join(xbmcvfs.translatePath(get_addon_info("profile")), "cache", name)
 
     if not os.path.exists(cache_folder):
         os.makedirs(cache_folder)
 
+    return cache_folder
+
+
+def use_cache(
+    name: str, ttl: int = 0, compress: bool = False, keep: Callable[[Any], bool] = bool
+) -> Callable[[Callable], Callable]:
+    """Return cached data while younger than ttl seconds, otherwise call the wrapped function and update cache.
+
+    Results are only written when keep(result) is true. Cached data is also returned, whatever its age, when the
+    wrapped function raises an exception or returns a result that is not kept. Cache files are keyed by name,
+    selected provider and channel groups, and call arguments (self excluded), and can be compressed using zlib.
+    """
+
     def decorator(func: Callable[[Any], Any]):
+        parameters = list(inspect.signature(func).parameters)
+        is_method = len(parameters) > 0 and parameters[0] == "self"
+
+        @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            result = {}
+            cache_folder = get_cache_folder()
+            key_args = args[1:] if is_method else args
+            filepath = os.path.join(cache_folder, _get_cache_filename(name, key_args, kwargs, compress))
+
+            if ttl > 0 and _get_cache_file_age(filepath) <= ttl:
+                try:
+                    return _read_cache_file(filepath)
+                except (OSError, ValueError, zlib.error):
+                    log(f"Can't read cache file {filepath}", xbmc.LOGWARNING)
 
             try:
                 result = func(*args, **kwargs)
-                with open(os.path.join(cache_folder, filepath), "wb") as file:
-                    file.write(json.dumps(result).encode("utf-8"))
             except Exception:
                 log("Can't load data: using cache instead", xbmc.LOGWARNING)
-                with open(os.path.join(cache_folder, filepath), encoding="utf-8") as file:
-                    result = json.loads("".join(file.readlines()))
+                try:
+                    return _read_cache_file(filepath)
+                except (OSError, ValueError, zlib.error):
+                    log("No usable cache found", xbmc.LOGWARNING)
+                    raise
 
+            if not keep(result):
+                log("Empty result: using cache instead", xbmc.LOGWARNING)
+                try:
+                    return _read_cache_file(filepath)
+                except (OSError, ValueError, zlib.error):
+                    return result
+
+            data = json.dumps(result).encode("utf-8")
+            write_file_atomically(filepath, zlib.compress(data) if compress else data)
+            evict_files(cache_folder, _CACHE_MAX_SIZE, by_access_time=True)
             return result
 
         return wrapper
 
     return decorator
+
+
+def write_file_atomically(filepath: str, data: bytes) -> bool:
+    """Write data into a temporary file then rename it, so that readers never see a partially written file.
+
+    Return False when the file could not be written.
+    """
+    tmp_filepath = get_tmp_filepath(filepath)
+
+    try:
+        with open(tmp_filepath, "wb") as file:
+            file.write(data)
+        os.replace(tmp_filepath, filepath)
+    except OSError as e:
+        log(f"Cannot write {filepath}: {e}", xbmc.LOGWARNING)
+        with suppress(OSError):
+            os.remove(tmp_filepath)
+        return False
+
+    return True
+
+
+def get_tmp_filepath(filepath: str) -> str:
+    """Return temporary file path for filepath, unique to the current process and thread."""
+    return f"{filepath}.{os.getpid()}.{get_ident()}.tmp"
+
+
+def evict_files(folder: str, max_size: int, by_access_time: bool = False) -> List[str]:
+    """Remove least recently used files of folder above max_size bytes. Return the names of the removed files.
+
+    Files are ordered by modification time, or by access time when files are marked as used on read. Temporary and
+    lock files are left alone, files removed by another thread or process meanwhile are skipped.
+    """
+    entries = []
+
+    for entry in os.scandir(folder):
+        if entry.name.endswith((".tmp", ".lock")):
+            continue
+
+        with suppress(OSError):
+            if entry.is_file():
+                entries.append((entry, entry.stat()))
+
+    entries.sort(key=lambda entry_stat: entry_stat[1].st_atime if by_access_time else entry_stat[1].st_mtime)
+    folder_size = sum(stat.st_size for _, stat in entries)
+    removed_filenames = []
+
+    for entry, stat in entries:
+        if folder_size <= max_size:
+            break
+
+        folder_size -= stat.st_size
+
+        with suppress(OSError):
+            os.remove(entry.path)
+            removed_filenames.append(entry.name)
+
+    return removed_filenames
+
+
+def _get_cache_filename(name: str, args: tuple, kwargs: dict, compress: bool) -> str:
+    """Return cache filename for name, selected provider and channel groups, and call arguments."""
+    provider_key = f"{get_addon_setting('provider.country')}.{get_addon_setting('provider.name')}"
+    key = json.dumps([provider_key, get_addon_setting("iptv.groups"), args, kwargs], sort_keys=True, default=repr)
+    return f"{name}_{sha1(key.encode('utf-8')).hexdigest()[:16]}.{'json.z' if compress else 'json'}"
+
+
+def _get_cache_file_age(filepath: str) -> float:
+    """Return cache file age in seconds, infinite if the file does not exist."""
+    try:
+        return time() - os.path.getmtime(filepath)
+    except OSError:
+        return float("inf")
+
+
+def _read_cache_file(filepath: str) -> Any:
+    """Read cache file, marking it as recently used."""
+    with open(filepath, "rb") as file:
+        data = file.read()
+
+    with suppress(OSError):
+        os.utime(filepath, (time(), os.path.getmtime(filepath)))
+
+    return json.loads(zlib.decompress(data) if filepath.endswith(".z") else data)
+
+
+class ChunkCache:
+    """Store chunks of JSON data on disk, each chunk having its own lifetime."""
+
+    def __init__(self, name: str):
+        """Initialize chunk cache into the given cache subfolder."""
+        self.folder = get_cache_folder(name)
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+
+    def get(self, key: str, max_age: float) -> Any:
+        """Return cached data for key, or None when missing or written more than max_age seconds ago."""
+        data = self._load(key, max_age)
+        self._count(hit=data is not None)
+        return data
+
+    def get_or_fetch(
+        self, key: str, max_age: float, fetch: Callable[[], Any], keep: Callable[[Any], bool] = bool
+    ) -> Any:
+        """Return cached data for key, otherwise fetch data and publish it when keep(data) is true.
+
+        A lock file makes concurrent processes missing the same key wait for the first one to publish its data, instead
+        of fetching it again. Waiting is given up after a timeout, and locks left by crashed processes are broken.
+        """
+        data = self._load(key, max_age)
+
+        if data is None:
+            with FileLock(f"{self._get_filepath(key)}.lock", _FETCH_LOCK_TIMEOUT, _FETCH_LOCK_STALE_AFTER):
+                data = self._load(key, max_age)
+
+                if data is None:
+                    self._count(hit=False)
+                    data = fetch()
+
+                    if keep(data):
+                        self.set(key, data)
+
+                    return data
+
+        self._count(hit=True)
+        return data
+
+    def set(self, key: str, data: Any) -> None:
+        """Write data for key, replacing the previous chunk atomically."""
+        write_file_atomically(self._get_filepath(key), json.dumps(data).encode("utf-8"))
+
+    def list_keys(self) -> List[str]:
+        """Return the keys of the stored chunks."""
+        return [filename[: -len(".json")] for filename in os.listdir(self.folder) if filename.endswith(".json")]
+
+    def get_age(self, key: str) -> float:
+        """Return the number of seconds since the chunk for key was written, or None when missing."""
+        try:
+            return time() - os.path.getmtime(self._get_filepath(key))
+        except OSError:
+            return None
+
+    def remove(self, key: str) -> None:
+        """Remove chunk for key."""
+        with suppress(OSError):
+            os.remove(self._get_filepath(key))
+
+    def prune(self, max_age: float) -> None:
+        """Remove every chunk written more than max_age seconds ago."""
+        now = time()
+
+        for entry in os.scandir(self.folder):
+            if entry.name.endswith(".json"):
+                with suppress(OSError):
+                    if now - entry.stat().st_mtime > max_age:
+                        os.remove(entry.path)
+
+    def retain(self, keys: Iterable[str]) -> None:
+        """Remove every chunk whose key is not listed."""
+        filenames = {os.path.basename(self._get_filepath(key)) for key in keys}
+
+        for filename in os.listdir(self.folder):
+            if filename.endswith(".json") and filename not in filenames:
+                with suppress(OSError):
+                    os.remove(os.path.join(self.folder, filename))
+
+    def _load(self, key: str, max_age: float) -> Any:
+        """Read data for key, None when missing or too old."""
+        filepath = self._get_filepath(key)
+
+        try:
+            if time() - os.path.getmtime(filepath) <= max_age:
+                with open(filepath, encoding="utf-8") as file:
+                    return json.load(file)
+        except (OSError, ValueError):
+            pass
+
+        return None
+
+    def _count(self, hit: bool) -> None:
+        """Update hit/miss counters."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _get_filepath(self, key: str) -> str:
+        """Return chunk file path for key."""
+        return os.path.join(self.folder, f"{key}.json")
@@ -0,0 +1,213 @@
+"""EPG utils."""
+
+from datetime import date, datetime
+from sys import intern
+from threading import Lock
+from time import localtime
+
+_UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MINUTES_SECONDS = [f"{minutes:02d}:{seconds:02d}" for minutes in range(60) for seconds in range(60)]
+
+# Window durations dividing a day, so that windows stay aligned on days whatever their size
+_WINDOW_HOURS = [1, 2, 3, 4, 6, 8, 12, 24]
+_WINDOW_SLOW_RESPONSE = 10
+_WINDOW_MAX_PROGRAMS = 15000
+_WINDOW_MIN_SAMPLES = 4
+_WINDOW_MIN_REFRESHES = 3
+_WINDOW_CEILING_REFRESHES = 20
+
+
+class EPGProgram:
+    """Compact program record, converted to JSON-EPG format only when serialized."""
+
+    __slots__ = ("start", "stop", "title", "subtitle", "episode", "description", "genre", "image")
+
+    def __init__(
+        self,
+        start: int,
+        stop: int,
+        title: str,
+        subtitle: str = None,
+        episode: str = None,
+        description: str = None,
+        genre: str = None,
+        image: str = None,
+    ):
+        """Initialize program record, interning the strings repeated across programs."""
+        self.start = start
+        self.stop = stop
+        self.title = _intern(title)
+        self.subtitle = subtitle
+        self.episode = _intern(episode)
+        self.description = description
+        self.genre = _intern(genre)
+        self.image = image
+
+    def to_json(self) -> dict:
+        """Return program following JSON-EPG format, leaving out empty fields."""
+        program = {
+            "start": _TIMESTAMP_FORMATTER.format(self.start, keep_microseconds=False),
+            "stop": _TIMESTAMP_FORMATTER.format(self.stop),
+        }
+
+        for key in ["title", "subtitle", "episode", "description", "genre", "image"]:
+            value = getattr(self, key)
+
+            if value is not None:
+                program[key] = value
+
+        return program
+
+
+class TimestampFormatter:
+    """Format timestamps as local ISO 8601 datetimes, computing UTC offsets once per hour instead of per timestamp."""
+
+    def __init__(self):
+        """Initialize formatter caches."""
+        self._offsets = {}
+        self._hour_prefixes = {}
+        self._offset_suffixes = {}
+
+    def format(self, timestamp: float, keep_microseconds: bool = True) -> str:
+        """Return the same string as datetime.fromtimestamp(timestamp).astimezone().isoformat()."""
+        offset = self._get_utc_offset(timestamp) if isinstance(timestamp, int) else None
+
+        # Fractional timestamps and offsets with seconds are not worth optimizing
+        if offset is None or offset % 60 != 0:
+            local_datetime = datetime.fromtimestamp(timestamp).astimezone()
+            return (local_datetime if keep_microseconds else local_datetime.replace(microsecond=0)).isoformat()
+
+        hour, seconds = divmod(timestamp + offset, 3600)
+        hour_prefix = self._hour_prefixes.get(hour)
+
+        if hour_prefix is None:
+            days, hours = divmod(hour, 24)
+            hour_prefix = f"{date.fromordinal(days + _UNIX_EPOCH_ORDINAL).isoformat()}T{hours:02d}:"
+            self._hour_prefixes[hour] = hour_prefix
+
+        offset_suffix = self._offset_suffixes.get(offset)
+
+        if offset_suffix is None:
+            offset_hours, offset_minutes = divmod(abs(offset) // 60, 60)
+            offset_suffix = f"{'-' if offset < 0 else '+'}{offset_hours:02d}:{offset_minutes:02d}"
+            self._offset_suffixes[offset] = offset_suffix
+
+        return f"{hour_prefix}{_MINUTES_SECONDS[seconds]}{offset_suffix}"
+
+    def _get_utc_offset(self, timestamp: int) -> int:
+        """Return local UTC offset at timestamp, from cache unless a DST transition happens within the same hour."""
+        hour = timestamp // 3600
+
+        if hour not in self._offsets:
+            # None marks hours containing a DST transition: their offsets are computed for each timestamp
+            offset = localtime(hour * 3600).tm_gmtoff
+            self._offsets[hour] = offset if localtime(hour * 3600 + 3599).tm_gmtoff == offset else None
+
+        offset = self._offsets[hour]
+        return offset if offset is not None else localtime(timestamp).tm_gmtoff
+
+
+class EPGWindowSizer:
+    """Size EPG request windows from the latency, size and failures of the requests made with the current size."""
+
+    def __init__(
+        self,
+        hours: int,
+        requests: int = 0,
+        failures: int = 0,
+        max_elapsed: float = 0,
+        max_programs: int = 0,
+        refreshes: int = 0,
+        ceiling: int = None,
+    ):
+        """Initialize sizer with the current window size and the stats collected with it so far.
+
+        Refreshes counts the previous refreshes made with the current size, ceiling is the smallest size found
+        overloaded so far.
+        """
+        self.hours = max([window_hours for window_hours in _WINDOW_HOURS if window_hours <= hours], default=1)
+        self.requests = requests
+        self.failures = failures
+        self.max_elapsed = max_elapsed
+        self.max_programs = max_programs
+        self.refreshes = refreshes
+        self.ceiling = ceiling
+        self._lock = Lock()
+
+    def record(self, elapsed: float, programs_count: int, failed: bool) -> None:
+        """Record the outcome of a request."""
+        with self._lock:
+            self.requests += 1
+            self.failures += int(failed)
+            self.max_elapsed = max(self.max_elapsed, elapsed)
+            self.max_programs = max(self.max_programs, programs_count)
+
+    def get_next_hours(self) -> int:
+        """Return window size for the next refresh.
+
+        Windows shrink as soon as a request fails, is slow or returns too many programs. They only grow once enough
+        requests over several refreshes have shown that the larger size would still leave a comfortable margin, and
+        many more refreshes are required to grow back to a size that was found overloaded.
+        """
+        index = _WINDOW_HOURS.index(self.hours)
+
+        if self._is_overloaded():
+            return _WINDOW_HOURS[max(0, index - 1)]
+
+        if self.requests < _WINDOW_MIN_SAMPLES or index + 1 == len(_WINDOW_HOURS):
+            return self.hours
+
+        next_hours = _WINDOW_HOURS[index + 1]
+        is_above_ceiling = self.ceiling is not None and next_hours >= self.ceiling
+        min_refreshes = _WINDOW_CEILING_REFRESHES if is_above_ceiling else _WINDOW_MIN_REFRESHES
+
+        if self.refreshes + 1 < min_refreshes:
+            return self.hours
+
+        ratio = next_hours / self.hours
+
+        if (
+            self.max_elapsed * ratio < _WINDOW_SLOW_RESPONSE / 2
+            and self.max_programs * ratio < _WINDOW_MAX_PROGRAMS / 2
+        ):
+            return next_hours
+
+        return self.hours
+
+    def to_dict(self) -> dict:
+        """Return sizer state for the next refresh, stats being reset when the window size changes."""
+        next_hours = self.get_next_hours()
+        ceiling = min(self.hours, self.ceiling or self.hours) if self._is_overloaded() else self.ceiling
+
+        if next_hours != self.hours or self._is_overloaded():
+            return {"hours": next_hours, "ceiling": ceiling}
+
+        return {
+            "hours": self.hours,
+            "requests": self.requests,
+            "failures": self.failures,
+            "max_elapsed": self.max_elapsed,
+            "max_programs": self.max_programs,
+            "refreshes": self.refreshes + 1,
+            "ceiling": ceiling,
+        }
+
+    def _is_overloaded(self) -> bool:
+        """Check if a request failed, was slow or returned too many programs."""
+        return self.failures > 0 or self.max_elapsed > _WINDOW_SLOW_RESPONSE or self.max_programs > _WINDOW_MAX_PROGRAMS
+
+
+_TIMESTAMP_FORMATTER = TimestampFormatter()
+
+
+def to_json(obj: object) -> dict:
+    """Convert EPG records to JSON serializable data, to be used as JSON encoder default function."""
+    if isinstance(obj, EPGProgram):
+        return obj.to_json()
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _intern(value: str) -> str:
+    """Intern value when it is a string."""
+    return intern(value) if isinstance(value, str) else value
@@ -0,0 +1,94 @@
+"""Cross-process lock utils."""
+
+import os
+from contextlib import suppress
+from time import monotonic, sleep, time
+from uuid import uuid4
+
+import xbmc
+
+from lib.utils.kodi import log
+
+_POLL_INTERVAL = 0.05
+
+
+class FileLock:
+    """Lock shared by concurrent plugin invocations, held as long as its lock file holds the token of its owner."""
+
+    def __init__(self, filepath: str, timeout: float = 30, stale_after: float = 60):
+        """Initialize lock on file path, given up after timeout seconds and broken when older than stale_after."""
+        self.filepath = filepath
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.acquired = False
+        self.token = f"{os.getpid()}:{uuid4().hex}"
+
+    def acquire(self) -> bool:
+        """Wait for the lock to be free then take it. Return False when the lock could not be taken in time."""
+        deadline = monotonic() + self.timeout
+
+        while True:
+            try:
+                fd = os.open(self.filepath, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, self.token.encode())
+                os.close(fd)
+                self.acquired = True
+                return True
+            except FileExistsError:
+                pass
+            except OSError as e:
+                log(f"Cannot create lock file {self.filepath}: {e}", xbmc.LOGWARNING)
+                return False
+
+            stale_token = self._get_stale_token()
+
+            if stale_token is not None:
+                # Another waiter may have broken the same lock and taken it already: only remove the stale one
+                log(f"Breaking stale lock {self.filepath}", xbmc.LOGWARNING)
+                self._remove_if_owned_by(stale_token)
+                continue
+
+            if monotonic() >= deadline:
+                log(f"Timed out waiting for lock {self.filepath}", xbmc.LOGWARNING)
+                return False
+
+            sleep(_POLL_INTERVAL)
+
+    def release(self) -> None:
+        """Release the lock when held, unless it has been broken and taken by someone else meanwhile."""
+        if self.acquired:
+            self._remove_if_owned_by(self.token)
+            self.acquired = False
+
+    def __enter__(self) -> "FileLock":
+        """Acquire the lock, going on without it after timeout."""
+        self.acquire()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Release the lock."""
+        self.release()
+
+    def _read_token(self) -> str:
+        """Return the token of the current owner of the lock, None when the lock is free."""
+        try:
+            with open(self.filepath, encoding="utf-8") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def _get_stale_token(self) -> str:
+        """Return the token of the lock when it was left by a process that died or hung while holding it, else None."""
+        try:
+            if time() - os.path.getmtime(self.filepath) <= self.stale_after:
+                return None
+        except OSError:
+            return None
+
+        return self._read_token()
+
+    def _remove_if_owned_by(self, token: str) -> None:
+        """Remove the lock file when it holds the given token."""
+        if self._read_token() == token:
+            with suppress(OSError):
+                os.remove(self.filepath)
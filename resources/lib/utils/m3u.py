@@ -0,0 +1,54 @@
+"""M3U utils."""
+
+import json
+import os
+from hashlib import sha256
+from typing import List
+
+import xbmc
+
+from lib.utils.cache import write_file_atomically
+from lib.utils.kodi import log
+
+
+def export_m3u(filepath: str, streams: List[dict]) -> bool:
+    """Write JSON-STREAMS formatted channels into an M3U8 playlist, only when channel list fingerprint has changed."""
+    fingerprint = sha256(json.dumps(streams, sort_keys=True).encode("utf-8")).hexdigest()
+    fingerprint_filepath = f"{filepath}.sha256"
+
+    try:
+        with open(fingerprint_filepath, encoding="utf-8") as file:
+            previous_fingerprint = file.read().strip()
+    except OSError:
+        previous_fingerprint = None
+
+    if fingerprint == previous_fingerprint and os.path.exists(filepath):
+        log("M3U playlist unchanged", xbmc.LOGINFO)
+        return False
+
+    lines = ["#EXTM3U"]
+
+    for stream in streams:
+        attributes = {
+            "tvg-id": stream["id"],
+            "tvg-name": stream["name"],
+            "tvg-logo": stream.get("logo") or "",
+            "tvg-chno": stream.get("preset") or "",
+            "group-title": ";".join(stream.get("group") or []),
+        }
+        attributes = " ".join(f'{key}="{_escape(value)}"' for key, value in attributes.items())
+        lines.append(f"#EXTINF:-1 {attributes},{stream['name']}")
+        lines.append(stream["stream"])
+
+    if not write_file_atomically(filepath, ("\n".join(lines) + "\n").encode("utf-8")):
+        return False
+
+    write_file_atomically(fingerprint_filepath, fingerprint.encode("utf-8"))
+
+    log(f"M3U playlist written to {filepath}", xbmc.LOGINFO)
+    return True
+
+
+def _escape(value: str) -> str:
+    """Make value safe to be used as M3U attribute value."""
+    return str(value).replace('"', "'")
@@ -0,0 +1,134 @@
+"""Request metrics utils."""
+
+import json
+import os
+import re
+from string import Formatter
+from threading import Lock
+from time import time
+from urllib.parse import urlsplit
+
+import xbmc
+import xbmcvfs
+
+from lib.utils.cache import write_file_atomically
+from lib.utils.kodi import get_addon_info, get_addon_setting, log
+
+_METRICS_FILENAME = "metrics.jsonl"
+_METRICS_MAX_SIZE = 1024 * 1024
+
+# Fallback for unknown endpoints: path segments holding ids, numbers, hexadecimal hashes and UUIDs, possibly prefixed
+# (cat_123), and file names ending the path (poster.jpg)
+_ID_SEGMENT_PATTERN = re.compile(
+    r"/(?:[^/]*?[_-])?(?:\d+|[0-9a-fA-F]{16,}|[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12})(?=/|$)"
+)
+_FILE_SEGMENT_PATTERN = re.compile(r"/[^/]+\.[0-9A-Za-z]{2,4}$")
+
+_ENDPOINT_TEMPLATES = []
+_METRICS_ENABLED = None
+_METRICS_LOCK = Lock()
+
+
+def is_metrics_enabled() -> bool:
+    """Return whether request metrics are collected, reading the setting once per invocation."""
+    global _METRICS_ENABLED
+
+    if _METRICS_ENABLED is None:
+        _METRICS_ENABLED = get_addon_setting("debug.metrics", bool)
+
+    return _METRICS_ENABLED
+
+
+def register_endpoint_templates(*urls: str) -> None:
+    """Register the URL format strings of known endpoints, so that their requests are aggregated per format string.
+
+    Placeholders match a single path segment, except {path} which matches the rest of the path.
+    """
+    for url in urls:
+        parts = urlsplit(url)
+        template = f"{parts.netloc}{parts.path}"
+        pattern = ""
+
+        for literal, field_name, _, _ in Formatter().parse(template):
+            pattern += re.escape(literal)
+
+            if field_name is not None:
+                pattern += ".+" if field_name == "path" else "[^/]+"
+
+        _ENDPOINT_TEMPLATES.append((re.compile(pattern), template))
+
+
+def get_endpoint_template(url: str) -> str:
+    """Return endpoint template for url, dropping query string and replacing ids in path."""
+    parts = urlsplit(url)
+    endpoint = f"{parts.netloc}{parts.path}"
+
+    for pattern, template in _ENDPOINT_TEMPLATES:
+        if pattern.fullmatch(endpoint):
+            return template
+
+    path = _ID_SEGMENT_PATTERN.sub("/{id}", _FILE_SEGMENT_PATTERN.sub("/{file}", parts.path))
+    return f"{parts.netloc}{path}"
+
+
+def record_metrics(url: str, **values: float) -> None:
+    """Append metrics for the endpoint of url to the rolling metrics file."""
+    filepath = _get_metrics_filepath()
+    line = json.dumps({"endpoint": get_endpoint_template(url), "time": time(), **values})
+
+    with _METRICS_LOCK:
+        try:
+            with open(filepath, "a", encoding="utf-8") as file:
+                file.write(f"{line}\n")
+
+            if os.path.getsize(filepath) > _METRICS_MAX_SIZE:
+                _truncate_metrics(filepath)
+        except OSError as e:
+            log(f"Cannot write metrics: {e}", xbmc.LOGWARNING)
+
+
+def load_metrics_summary() -> list:
+    """Aggregate recorded metrics per endpoint, sorted by total request time."""
+    summary = {}
+
+    try:
+        with open(_get_metrics_filepath(), encoding="utf-8") as file:
+            for line in file:
+                try:
+                    metrics = json.loads(line)
+                except ValueError:
+                    continue
+
+                endpoint = summary.setdefault(metrics.pop("endpoint"), {"requests": 0, "errors": 0})
+                metrics.pop("time", None)
+
+                if "elapsed_ms" in metrics:
+                    endpoint["requests"] += 1
+
+                endpoint["errors"] += metrics.pop("error", 0)
+
+                for key, value in metrics.items():
+                    endpoint[f"{key}_total"] = endpoint.get(f"{key}_total", 0) + value
+                    endpoint[f"{key}_count"] = endpoint.get(f"{key}_count", 0) + 1
+                    endpoint[f"{key}_max"] = max(endpoint.get(f"{key}_max", 0), value)
+    except OSError:
+        return []
+
+    return sorted(
+        ({"endpoint": endpoint, **metrics} for endpoint, metrics in summary.items()),
+        key=lambda metrics: metrics.get("elapsed_ms_total", 0),
+        reverse=True,
+    )
+
+
+def _get_metrics_filepath() -> str:
+    """Return metrics file path."""
+    return os.path.join(xbmcvfs.translatePath(get_addon_info("profile")), _METRICS_FILENAME)
+
+
+def _truncate_metrics(filepath: str) -> None:
+    """Only keep the most recent half of the metrics file."""
+    with open(filepath, encoding="utf-8") as file:
+        lines = file.readlines()
+
+    write_file_atomically(filepath, "".join(lines[len(lines) // 2 :]).encode("utf-8"))
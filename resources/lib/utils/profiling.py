@@ -0,0 +1,45 @@
+"""Profiling utils."""
+
+import cProfile
+import os
+import re
+from contextlib import suppress
+from datetime import datetime
+from typing import Any, Callable
+
+import xbmc
+import xbmcvfs
+
+from lib.utils.kodi import get_addon_info, log
+
+_PROFILES_MAX_COUNT = 20
+
+
+def run_with_profiler(func: Callable[[], Any], route: str) -> Any:
+    """Run func under cProfile and save stats into the addon profile folder, keeping the most recent ones only."""
+    profiles_folder = os.path.join(xbmcvfs.translatePath(get_addon_info("profile")), "profiles")
+
+    if not os.path.exists(profiles_folder):
+        os.makedirs(profiles_folder)
+
+    route_name = re.sub(r"\W+", "_", route).strip("_") or "index"
+    filepath = os.path.join(profiles_folder, f"{datetime.now():%Y%m%d-%H%M%S}_{os.getpid()}_{route_name}.prof")
+
+    profiler = cProfile.Profile()
+
+    try:
+        return profiler.runcall(func)
+    finally:
+        profiler.dump_stats(filepath)
+        log(f"Profile saved to {filepath}", xbmc.LOGINFO)
+        _rotate_profiles(profiles_folder)
+
+
+def _rotate_profiles(profiles_folder: str) -> None:
+    """Remove the oldest profiles above the retention limit."""
+    entries = [entry for entry in os.scandir(profiles_folder) if entry.name.endswith(".prof")]
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+
+    for entry in entries[_PROFILES_MAX_COUNT:]:
+        with suppress(OSError):
+            os.remove(entry.path)
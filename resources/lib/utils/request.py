@@ -1,15 +1,24 @@
 """Request utils."""
 
+import json
+import os
+from hashlib import sha1
+from http.cookiejar import DefaultCookiePolicy
 from random import randint
+from threading import Lock
+from time import monotonic, time
 from typing import Mapping, Union
 
 import xbmc
 from requests import Response, Session
+from requests.adapters import HTTPAdapter, Retry
 from requests.exceptions import JSONDecodeError, RequestException
 
 # from socks import SOCKS5
 # from sockshandler import SocksiPyHandler
+from lib.utils.cache import evict_files, get_cache_folder, write_file_atomically
 from lib.utils.kodi import get_addon_setting, log
+from lib.utils.metrics import is_metrics_enabled, record_metrics
 
 _USER_AGENTS = [
     # Chrome
@@ -32,12 +41,58 @@ _USER_AGENTS = [
 
 _RANDOM_USER_AGENT = _USER_AGENTS[randint(0, len(_USER_AGENTS) - 1)]
 
+_POOL_CONNECTIONS = 10
+_RETRY_BACKOFF_FACTOR = 0.5
+_RETRY_STATUS_FORCELIST = [429, 500, 502, 503, 504]
+
+_RESPONSE_CACHE_MAX_SIZE = 10 * 1024 * 1024
+
+_SESSION = None
+_SESSION_LOCK = Lock()
+
 
 def get_random_ua() -> str:
     """Get a randomised user agent."""
     return _RANDOM_USER_AGENT
 
 
+def get_session() -> Session:
+    """Return the process-wide HTTP session, keeping connections alive between requests."""
+    global _SESSION
+
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = _create_session()
+
+    return _SESSION
+
+
+def _create_session() -> Session:
+    """Create an HTTP session with per-host connection pools and optional retries on idempotent requests."""
+    pool_size = max(1, get_addon_setting("network.pool_size", int))
+    retries = max(0, get_addon_setting("network.retries", int))
+
+    max_retries = Retry(
+        total=retries,
+        backoff_factor=_RETRY_BACKOFF_FACTOR,
+        status_forcelist=_RETRY_STATUS_FORCELIST,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+    )
+
+    adapter = HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=pool_size, max_retries=max_retries)
+
+    session = Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    # Requests without session used to be stateless: do not share cookies between them
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    log(f"HTTP session created (pool size: {pool_size}, retries: {retries})", xbmc.LOGDEBUG)
+    return session
+
+
 def request(method: str, url: str, headers: Mapping[str, str] = None, data=None, session: Session = None) -> Response:
     """Send HTTP request using requests."""
     default_headers = {
@@ -49,17 +104,68 @@ def request(method: str, url: str, headers: Mapping[str, str] = None, data=None,
     }
 
     headers = {**(session.headers if session is not None else default_headers), **(headers or {})}
-    session = session or Session()
+    session = session or get_session()
 
     log(f"Fetching {url}", xbmc.LOGDEBUG)
-    res = session.request(method, url, headers=headers, data=data)
+
+    if is_metrics_enabled():
+        res = _send_with_metrics(session, method, url, headers, data)
+    else:
+        res = session.request(method, url, headers=headers, data=data)
+
     res.raise_for_status()
     log(f" -> {res.status_code}", xbmc.LOGDEBUG)
     return res
 
 
-def request_json(url: str, headers: Mapping[str, str] = None, default: Union[dict, list] = None) -> Union[dict, list]:
-    """Send HTTP request and load json response."""
+def _send_with_metrics(session: Session, method: str, url: str, headers: Mapping[str, str], data) -> Response:
+    """Send HTTP request and record its timings, response size and status."""
+    started_at = monotonic()
+
+    try:
+        res = session.request(method, url, headers=headers, data=data)
+    except RequestException:
+        record_metrics(url, elapsed_ms=(monotonic() - started_at) * 1000, error=1)
+        raise
+
+    # Response elapsed time stops once headers are parsed: it covers connection and time to first byte
+    elapsed_ms = (monotonic() - started_at) * 1000
+    headers_ms = res.elapsed.total_seconds() * 1000
+
+    record_metrics(
+        url,
+        elapsed_ms=elapsed_ms,
+        headers_ms=headers_ms,
+        download_ms=max(0, elapsed_ms - headers_ms),
+        size=len(res.content),
+        error=int(res.status_code >= 400),
+    )
+
+    return res
+
+
+def request_json(
+    url: str, headers: Mapping[str, str] = None, default: Union[dict, list] = None, max_age: int = None
+) -> Union[dict, list]:
+    """Send HTTP request and load json response.
+
+    When max_age is set, the response is cached on disk: it is served without any request for max_age seconds, then
+    revalidated using ETag/Last-Modified validators.
+    """
+    headers = {**(headers or {})}
+    cached_response = _load_cached_response(url) if max_age is not None else None
+
+    if cached_response is not None:
+        if time() - cached_response["stored_at"] <= max_age:
+            log(f"Using cached response for {url}", xbmc.LOGDEBUG)
+            return cached_response["content"]
+
+        if cached_response.get("etag"):
+            headers["If-None-Match"] = cached_response["etag"]
+
+        if cached_response.get("last_modified"):
+            headers["If-Modified-Since"] = cached_response["last_modified"]
+
     try:
         res = request("GET", url, headers=headers)
         res.raise_for_status()
@@ -67,6 +173,13 @@ def request_json(url: str, headers: Mapping[str, str] = None, default: Union[dic
         log(e, xbmc.LOGWARNING)
         return default
 
+    if res.status_code == 304 and cached_response is not None:
+        cached_response["stored_at"] = time()
+        _store_cached_response(url, cached_response)
+        return cached_response["content"]
+
+    decode_started_at = monotonic()
+
     try:
         content = res.json()
     except JSONDecodeError:
@@ -74,9 +187,48 @@ def request_json(url: str, headers: Mapping[str, str] = None, default: Union[dic
         log(res.text, xbmc.LOGDEBUG)
         return default
 
+    if is_metrics_enabled():
+        record_metrics(url, decode_ms=(monotonic() - decode_started_at) * 1000)
+
+    if max_age is not None:
+        cached_response = {
+            "etag": res.headers.get("ETag"),
+            "last_modified": res.headers.get("Last-Modified"),
+            "stored_at": time(),
+            "content": content,
+        }
+        _store_cached_response(url, cached_response)
+
     return content
 
 
+def _get_cached_response_filepath(url: str) -> str:
+    """Return response cache file path for url."""
+    return os.path.join(get_cache_folder("responses"), f"{sha1(url.encode()).hexdigest()}.json")
+
+
+def _load_cached_response(url: str) -> dict:
+    """Load cached response for url, marking it as recently used."""
+    filepath = _get_cached_response_filepath(url)
+
+    try:
+        with open(filepath, encoding="utf-8") as file:
+            cached_response = json.load(file)
+        os.utime(filepath)
+    except (OSError, ValueError):
+        return None
+
+    return cached_response
+
+
+def _store_cached_response(url: str, cached_response: dict) -> None:
+    """Write cached response for url, then evict least recently used responses above the cache size limit."""
+    filepath = _get_cached_response_filepath(url)
+
+    if write_file_atomically(filepath, json.dumps(cached_response).encode("utf-8")):
+        evict_files(os.path.dirname(filepath), _RESPONSE_CACHE_MAX_SIZE)
+
+
 def to_cookie_string(cookies: dict, pick: list = None) -> str:
     """Convert cookies to cookie string."""
     if pick is None:
@@ -0,0 +1,56 @@
+"""Token store utils."""
+
+import json
+import os
+from contextlib import suppress
+
+import xbmcvfs
+
+from lib.utils.cache import write_file_atomically
+from lib.utils.kodi import get_addon_info
+from lib.utils.lock import FileLock
+
+_LOCK_TIMEOUT = 30
+_LOCK_STALE_AFTER = 60
+
+
+class TokenStore:
+    """Store provider session data in the addon profile, where every plugin invocation reads the same tokens."""
+
+    def __init__(self, name: str):
+        """Initialize token store file for the given name."""
+        folder = os.path.join(xbmcvfs.translatePath(get_addon_info("profile")), "sessions")
+
+        os.makedirs(folder, exist_ok=True)
+
+        self.filepath = os.path.join(folder, f"{name}.json")
+
+    def load(self) -> dict:
+        """Return stored session data, empty if missing or unreadable."""
+        try:
+            with open(self.filepath, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, session_data: dict) -> None:
+        """Replace stored session data."""
+        write_file_atomically(self.filepath, json.dumps(session_data).encode("utf-8"))
+
+    def mark_used(self) -> None:
+        """Record that session data has just been used to load a stream."""
+        with suppress(OSError):
+            with open(f"{self.filepath}.used", "a"):
+                pass
+            os.utime(f"{self.filepath}.used")
+
+    def get_last_used(self) -> float:
+        """Return the timestamp at which session data was last used to load a stream, None if never."""
+        try:
+            return os.path.getmtime(f"{self.filepath}.used")
+        except OSError:
+            return None
+
+    def lock(self) -> FileLock:
+        """Return the lock to hold while renewing session data."""
+        return FileLock(f"{self.filepath}.lock", timeout=_LOCK_TIMEOUT, stale_after=_LOCK_STALE_AFTER)
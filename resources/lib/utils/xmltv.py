@@ -0,0 +1,122 @@
+"""XMLTV utils."""
+
+import gzip
+import os
+from contextlib import suppress
+from datetime import datetime
+from hashlib import sha256
+from typing import Any, Iterable, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+import xbmc
+
+from lib.utils.cache import get_tmp_filepath, write_file_atomically
+from lib.utils.epg import EPGProgram
+from lib.utils.kodi import log
+
+
+class XMLTVWriter:
+    """Write XMLTV data element by element into a gzip file, without building the whole document in memory."""
+
+    def __init__(self, file: gzip.GzipFile):
+        """Initialize XMLTV writer over a binary file."""
+        self.file = file
+        self.hash = sha256()
+
+    def write_header(self) -> None:
+        """Write XML declaration and open root element."""
+        self._write('<?xml version="1.0" encoding="UTF-8"?>\n<!DOCTYPE tv SYSTEM "xmltv.dtd">\n<tv>\n')
+
+    def write_footer(self) -> None:
+        """Close root element."""
+        self._write("</tv>\n")
+
+    def write_channel(self, stream: dict) -> None:
+        """Write a channel element from JSON-STREAMS formatted data."""
+        element = f"  <channel id={quoteattr(stream['id'])}>\n"
+        element += f"    <display-name>{escape(stream['name'])}</display-name>\n"
+
+        if stream.get("logo"):
+            element += f"    <icon src={quoteattr(stream['logo'])}/>\n"
+
+        self._write(f"{element}  </channel>\n")
+
+    def write_programme(self, channel_id: str, program: Any) -> None:
+        """Write a programme element from an EPG record or JSON-EPG formatted data."""
+        if isinstance(program, EPGProgram):
+            program = program.to_json()
+
+        start = _to_xmltv_date(program["start"])
+        stop = _to_xmltv_date(program["stop"])
+
+        element = f"  <programme start={quoteattr(start)} stop={quoteattr(stop)} channel={quoteattr(channel_id)}>\n"
+        element += f"    <title>{escape(program.get('title') or '')}</title>\n"
+
+        if program.get("subtitle"):
+            element += f"    <sub-title>{escape(program['subtitle'])}</sub-title>\n"
+
+        if program.get("description"):
+            element += f"    <desc>{escape(program['description'])}</desc>\n"
+
+        if program.get("genre"):
+            element += f"    <category>{escape(program['genre'])}</category>\n"
+
+        if program.get("image"):
+            element += f"    <icon src={quoteattr(program['image'])}/>\n"
+
+        if program.get("episode"):
+            element += f'    <episode-num system="onscreen">{escape(program["episode"])}</episode-num>\n'
+
+        self._write(f"{element}  </programme>\n")
+
+    def _write(self, data: str) -> None:
+        """Write data to file and update content hash."""
+        encoded_data = data.encode("utf-8")
+        self.hash.update(encoded_data)
+        self.file.write(encoded_data)
+
+
+def export_xmltv(filepath: str, streams: Iterable[dict], programs: Iterable[Tuple[str, Any]]) -> bool:
+    """Write XMLTV data into a gzip file, replacing the existing file only when content has changed."""
+    tmp_filepath = get_tmp_filepath(filepath)
+    hash_filepath = f"{filepath}.sha256"
+
+    try:
+        # Zeroed mtime keeps gzip output identical for identical content
+        with gzip.GzipFile(tmp_filepath, "wb", mtime=0) as file:
+            writer = XMLTVWriter(file)
+            writer.write_header()
+
+            for stream in streams:
+                writer.write_channel(stream)
+
+            for channel_id, program in programs:
+                writer.write_programme(channel_id, program)
+
+            writer.write_footer()
+
+        content_hash = writer.hash.hexdigest()
+
+        try:
+            with open(hash_filepath, encoding="utf-8") as file:
+                previous_content_hash = file.read().strip()
+        except OSError:
+            previous_content_hash = None
+
+        if content_hash == previous_content_hash and os.path.exists(filepath):
+            log("XMLTV content unchanged", xbmc.LOGINFO)
+            return False
+
+        os.replace(tmp_filepath, filepath)
+        write_file_atomically(hash_filepath, content_hash.encode("utf-8"))
+
+        log(f"XMLTV written to {filepath}", xbmc.LOGINFO)
+        return True
+    finally:
+        with suppress(OSError):
+            os.remove(tmp_filepath)
+
+
+def _to_xmltv_date(iso_date: str) -> str:
+    """Convert ISO 8601 date to XMLTV date format."""
+    return datetime.fromisoformat(iso_date).strftime("%Y%m%d%H%M%S %z")
@@ -0,0 +1,119 @@
+"""Addon service entry point."""
+
+from time import time
+
+import xbmc
+from lib.exceptions import StreamRequestException
+from lib.providers import get_provider
+from lib.providers.abstract_provider import AbstractProvider
+from lib.utils.kodi import get_addon_setting, log
+
+_CHECK_INTERVAL = 60
+_REFRESH_MARGIN = 5 * 60
+_IDLE_TIMEOUT = 2 * 60 * 60
+_MIN_RETRY_DELAY = 5 * 60
+_MAX_RETRY_DELAY = 6 * 60 * 60
+_M3U_EXPORT_INTERVAL = 60 * 60
+_XMLTV_EXPORT_INTERVAL = 12 * 60 * 60
+_EXPORT_RETRY_DELAY = 60 * 60
+
+
+class SessionKeeper:
+    """Renew provider session ahead of its expiry while it is in use, backing off after failed renewals."""
+
+    def __init__(self, provider: AbstractProvider):
+        """Initialize session keeper for the given provider."""
+        self.provider = provider
+        self.retry_delay = 0
+        self.next_attempt_at = 0
+
+    def tick(self) -> None:
+        """Renew session when it is about to expire, unless it is idle or the last renewal failed recently."""
+        now = time()
+
+        if now < self.next_attempt_at or not self._is_session_in_use(now):
+            return
+
+        try:
+            self.provider.refresh_session(_REFRESH_MARGIN)
+        except StreamRequestException as e:
+            log(f"Cannot renew session data: {e}", xbmc.LOGWARNING)
+            self._back_off(now)
+            return
+
+        if not self._is_session_valid(now):
+            log("Renewed session data is not valid", xbmc.LOGWARNING)
+            self._back_off(now)
+            return
+
+        self.retry_delay = 0
+
+    def _is_session_in_use(self, now: float) -> bool:
+        """Check if a valid session has been obtained and was used to load a stream recently."""
+        last_used = self.provider.get_session_last_used()
+        return (
+            self.provider.get_session_expiry() is not None and last_used is not None and now - last_used < _IDLE_TIMEOUT
+        )
+
+    def _is_session_valid(self, now: float) -> bool:
+        """Check if session stays valid for the whole refresh margin."""
+        expiry = self.provider.get_session_expiry()
+        return expiry is not None and expiry > now + _REFRESH_MARGIN
+
+    def _back_off(self, now: float) -> None:
+        """Postpone next renewal, doubling the delay after each consecutive failure."""
+        self.retry_delay = min(max(self.retry_delay * 2, _MIN_RETRY_DELAY), _MAX_RETRY_DELAY)
+        self.next_attempt_at = now + self.retry_delay
+        log(f"Next session renewal attempt in {self.retry_delay} s", xbmc.LOGINFO)
+
+
+class ExportScheduler:
+    """Run an export when the service starts and then periodically, so that exported files stay up to date."""
+
+    def __init__(self, export: str, interval: int):
+        """Initialize scheduler of the given Export Manager method, the first export being due right away."""
+        self.export = export
+        self.interval = interval
+        self.next_export_at = 0
+
+    def tick(self) -> None:
+        """Run export when due, retrying sooner after a failure."""
+        now = time()
+
+        if now < self.next_export_at:
+            return
+
+        from lib.managers import ExportManager
+
+        log(f"Running scheduled {self.export}", xbmc.LOGINFO)
+
+        try:
+            getattr(ExportManager(), self.export)()
+        except Exception as e:
+            log(f"Cannot run scheduled {self.export}: {e}", xbmc.LOGWARNING)
+            self.next_export_at = now + min(self.interval, _EXPORT_RETRY_DELAY)
+            return
+
+        self.next_export_at = now + self.interval
+
+
+if __name__ == "__main__":
+    monitor = xbmc.Monitor()
+    provider = get_provider()
+    session_keeper = SessionKeeper(provider) if provider is not None else None
+    export_schedulers = [
+        ExportScheduler("export_m3u", _M3U_EXPORT_INTERVAL),
+        ExportScheduler("export_xmltv", _XMLTV_EXPORT_INTERVAL),
+    ]
+    log("Starting session keep-alive service", xbmc.LOGDEBUG)
+
+    while not monitor.abortRequested():
+        if session_keeper is not None and get_addon_setting("provider.keep_session_alive", bool):
+            session_keeper.tick()
+
+        if provider is not None and get_addon_setting("iptv.auto_export", bool):
+            for export_scheduler in export_schedulers:
+                export_scheduler.tick()
+
+        if monitor.waitForAbort(_CHECK_INTERVAL):
+            break
@@ -0,0 +1,147 @@
+"""Benchmark harness: time and peak memory of hot paths, compared against a stored baseline.
+
+Durations are expressed in time units, the duration of a fixed pure Python workload measured between the runs of each
+benchmark, so that results recorded on one machine can be compared on another despite speed and load differences. Run
+with BENCHMARK_UPDATE_BASELINE=1 to store the results as the new baseline. Results are written into the pytest cache
+folder, unless BENCHMARK_RESULTS gives another file path.
+"""
+
+import gc
+import json
+import os
+import tracemalloc
+from time import perf_counter
+from typing import Any, Callable
+
+import pytest
+
+BASELINE_FILEPATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+_TIME_TOLERANCE = float(os.environ.get("BENCHMARK_TIME_TOLERANCE", "2.0"))
+_MEMORY_TOLERANCE = float(os.environ.get("BENCHMARK_MEMORY_TOLERANCE", "1.5"))
+_UPDATE_BASELINE = os.environ.get("BENCHMARK_UPDATE_BASELINE") == "1"
+
+_RESULTS = {}
+
+
+class Benchmark:
+    """Measure a function, record its results and fail when it regressed from the baseline."""
+
+    def __init__(self, name: str, baseline: dict):
+        """Initialize benchmark of the given name."""
+        self.name = name
+        self.baseline = baseline
+
+    def __call__(self, func: Callable[[], Any], setup: Callable[[], None] = None, rounds: int = 3) -> Any:
+        """Run func once to warm up, then rounds times to keep the best duration and once more to trace memory.
+
+        Setup is called before each run, outside of measurements. Return the result of the last timed run.
+        """
+        self._run(func, setup)
+        durations = []
+        time_units = []
+
+        for _ in range(rounds):
+            time_units.append(_measure_time_unit())
+            started_at, result = self._run(func, setup)
+            durations.append(perf_counter() - started_at)
+
+        if setup is not None:
+            setup()
+
+        gc.collect()
+        tracemalloc.start()
+
+        try:
+            func()
+            _, peak_size = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        measures = {
+            "seconds": round(min(durations), 4),
+            "time": round(min(durations) / min(time_units), 3),
+            "peak_kb": round(peak_size / 1024),
+        }
+        _RESULTS[self.name] = measures
+        self._check(measures)
+
+        return result
+
+    def _run(self, func: Callable[[], Any], setup: Callable[[], None]) -> tuple:
+        """Call setup then func, returning the time func started at and its result."""
+        if setup is not None:
+            setup()
+
+        started_at = perf_counter()
+        return started_at, func()
+
+    def _check(self, measures: dict) -> None:
+        """Fail when time or memory went above the baseline by more than the tolerance."""
+        baseline = self.baseline.get(self.name)
+
+        if _UPDATE_BASELINE or baseline is None:
+            return
+
+        if measures["time"] > baseline["time"] * _TIME_TOLERANCE:
+            pytest.fail(f"{self.name} took {measures['time']} time units, baseline is {baseline['time']}")
+
+        if measures["peak_kb"] > baseline["peak_kb"] * _MEMORY_TOLERANCE:
+            pytest.fail(f"{self.name} used {measures['peak_kb']} KiB at peak, baseline is {baseline['peak_kb']}")
+
+
+def _measure_time_unit() -> float:
+    """Return the best duration of a fixed workload mixing JSON coding, sorting and string formatting."""
+    data = [{"id": str(index), "title": f"title {index % 97}", "start": index * 60} for index in range(5000)]
+    durations = []
+
+    for _ in range(3):
+        started_at = perf_counter()
+        json.loads(json.dumps(sorted(data, key=lambda item: (item["title"], item["start"]))))
+        durations.append(perf_counter() - started_at)
+
+    return min(durations)
+
+
+@pytest.fixture(scope="session")
+def baseline() -> dict:
+    """Return stored baseline results."""
+    try:
+        with open(BASELINE_FILEPATH, encoding="utf-8") as file:
+            return json.load(file)
+    except OSError:
+        return {}
+
+
+@pytest.fixture
+def benchmark(request, baseline) -> Benchmark:
+    """Return a benchmark named after the test."""
+    return Benchmark(request.node.name, baseline)
+
+
+def pytest_sessionfinish(session, exitstatus) -> None:
+    """Write results, and update the baseline with them when requested."""
+    if not _RESULTS:
+        return
+
+    results_filepath = os.environ.get("BENCHMARK_RESULTS")
+
+    if not results_filepath:
+        results_filepath = str(session.config.cache.mkdir("benchmarks") / "results.json")
+
+    with open(results_filepath, "w", encoding="utf-8") as file:
+        json.dump(_RESULTS, file, indent=2, sort_keys=True)
+
+    if _UPDATE_BASELINE:
+        try:
+            with open(BASELINE_FILEPATH, encoding="utf-8") as file:
+                baseline = json.load(file)
+        except OSError:
+            baseline = {}
+
+        for name, measures in _RESULTS.items():
+            baseline[name] = {"time": measures["time"], "peak_kb": measures["peak_kb"]}
+
+        with open(BASELINE_FILEPATH, "w", encoding="utf-8") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+            file.write("\n")
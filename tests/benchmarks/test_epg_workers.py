@@ -0,0 +1,75 @@
+"""Benchmark of concurrent EPG chunk loading against a local HTTP server answering with latency."""
+
+import os
+import shutil
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from time import perf_counter, sleep
+
+import lib.providers.abstract_orange_provider
+import pytest
+from lib.providers.fr import OrangeFranceProvider
+from orange_api import OrangeAPI
+
+_LATENCY = 0.1
+
+pytestmark = pytest.mark.benchmark
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answer Orange API requests from fixtures after a fixed delay."""
+
+    def do_GET(self) -> None:
+        """Send fixture response."""
+        sleep(self.server.latency)
+        status_code, body = self.server.api.handle(self.path)
+
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        """Keep test output quiet."""
+
+
+@pytest.fixture
+def stub_server_url(monkeypatch) -> str:
+    """Serve 20 channels from a local HTTP server, Orange endpoints being redirected to it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    server.api = OrangeAPI(channels_count=20)
+    server.latency = _LATENCY
+    Thread(target=server.serve_forever, daemon=True).start()
+
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    module = lib.providers.abstract_orange_provider
+
+    for endpoint in ["_CHANNELS_ENDPOINT", "_PROGRAMS_ENDPOINT"]:
+        monkeypatch.setattr(module, endpoint, getattr(module, endpoint).replace("https://", f"{url}/", 1))
+
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+def test_epg_max_workers(stub_server_url, settings, kodi_profile):
+    """Loading EPG chunks with 4 workers takes a fraction of the time taken loading them one after the other."""
+    provider = OrangeFranceProvider()
+    elapsed = {}
+    epgs = {}
+
+    for max_workers in [4, 1, 4]:
+        settings["iptv.epg_max_workers"] = str(max_workers)
+        shutil.rmtree(os.path.join(kodi_profile, "cache"), ignore_errors=True)
+
+        started_at = perf_counter()
+        epgs[max_workers] = provider.get_epg()
+        elapsed[max_workers] = perf_counter() - started_at
+
+    assert {channel_id: [program.start for program in programs] for channel_id, programs in epgs[1].items()} == {
+        channel_id: [program.start for program in programs] for channel_id, programs in epgs[4].items()
+    }
+    assert elapsed[1] > 28 * _LATENCY
+    assert elapsed[4] < elapsed[1] / 2, f"EPG loaded in {elapsed[1]:.2f} s with 1 worker, {elapsed[4]:.2f} s with 4"
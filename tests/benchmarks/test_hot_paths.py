@@ -0,0 +1,108 @@
+"""Benchmarks of the hot paths of channel, EPG and catchup loading, against Orange API fixtures."""
+
+import os
+import shutil
+import socket
+from threading import Thread
+
+import pytest
+from lib.managers.iptv_manager import IPTVManager
+from lib.providers.fr import OrangeFranceProvider
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture
+def provider(orange_api) -> OrangeFranceProvider:
+    """Return Orange France provider loading data from API fixtures."""
+    return OrangeFranceProvider()
+
+
+@pytest.fixture
+def clear_cache(kodi_profile):
+    """Return a function emptying the addon cache folder, so that each run loads data from the API."""
+    return lambda: shutil.rmtree(os.path.join(kodi_profile, "cache"), ignore_errors=True)
+
+
+@pytest.fixture
+def iptv_manager_port() -> int:
+    """Listen like IPTV Manager does, reading and discarding the payloads sent by the addon."""
+    server = socket.create_server(("127.0.0.1", 0))
+
+    def serve() -> None:
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+
+            with connection:
+                while connection.recv(65536):
+                    pass
+
+    Thread(target=serve, daemon=True).start()
+    yield server.getsockname()[1]
+    server.close()
+
+
+def test_get_streams(benchmark, provider, clear_cache):
+    """Load and convert live channels."""
+    streams = benchmark(provider.get_streams, setup=clear_cache)
+
+    assert len(streams) == 150
+    assert [stream["preset"] for stream in streams] == [str(preset) for preset in range(1, 151)]
+
+
+def test_get_epg(benchmark, provider, clear_cache):
+    """Load and convert 14 days of programs for every channel."""
+    epg = benchmark(provider.get_epg, setup=clear_cache, rounds=2)
+
+    assert len(epg) == 150
+    assert sum(len(programs) for programs in epg.values()) > 40000
+
+
+@pytest.mark.parametrize(
+    "levels",
+    [[], ["1000"], ["1000", "1000_0"], ["1000", "1000_0", "1000_0_0"]],
+    ids=["depth0", "depth1", "depth2", "depth3"],
+)
+def test_get_catchup_items(benchmark, provider, clear_cache, levels):
+    """Load and convert catchup directory items of each depth, 50 times."""
+
+    def get_catchup_items() -> list:
+        for _ in range(50):
+            clear_cache()
+            items = provider.get_catchup_items(levels)
+
+        return items
+
+    assert len(benchmark(get_catchup_items)) > 0
+
+
+def test_format_stream_info(benchmark, provider, orange_api):
+    """Convert stream data into stream info, 5000 times."""
+    stream = orange_api.get_stream("livetv_1000_ctv")
+    session_data = {"tv_token": "token", "wassup": "wassup"}
+
+    stream_infos = benchmark(lambda: [provider._format_stream_info(stream, session_data) for _ in range(5000)])
+
+    assert stream_infos[0]["path"] == "https://cdn.woopic.com/livetv_1000_ctv/index.mpd"
+
+
+def test_iptv_manager_send_channels(benchmark, provider, clear_cache, settings, iptv_manager_port):
+    """Serialize channels to IPTV Manager."""
+    settings["artwork.cache"] = "false"
+    iptv_manager = IPTVManager(iptv_manager_port)
+    iptv_manager.provider = provider
+
+    benchmark(iptv_manager.send_channels, setup=clear_cache, rounds=5)
+
+
+def test_iptv_manager_send_epg(benchmark, provider, iptv_manager_port):
+    """Serialize 14 days of programs for every channel to IPTV Manager."""
+    epg = provider.get_epg()
+    provider.get_epg = lambda: epg
+    iptv_manager = IPTVManager(iptv_manager_port)
+    iptv_manager.provider = provider
+
+    benchmark(iptv_manager.send_epg, rounds=2)
@@ -0,0 +1,61 @@
+"""Import time budget of the plugin entry point and of the catchup route, measured with python -X importtime."""
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+_ADDON_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_IMPORT_TIME_PATTERN = re.compile(r"import time:\s+\d+ \|\s+(?P<cumulative>\d+) \| *(?P<module>\S+)")
+_BUDGET_FACTOR = float(os.environ.get("IMPORT_TIME_BUDGET_FACTOR", "1"))
+
+pytestmark = pytest.mark.benchmark
+
+# Modules only needed to play streams or to feed IPTV Manager
+_PLAYBACK_AND_IPTV_MODULES = [
+    "inputstreamhelper",
+    "lib.managers.export_manager",
+    "lib.managers.iptv_manager",
+    "lib.managers.stream_manager",
+    "lib.utils.m3u",
+    "lib.utils.xmltv",
+]
+
+
+def get_import_times(module: str) -> dict:
+    """Import module in a fresh interpreter, returning the cumulative import time in ms of each module it loaded."""
+    python_path = [os.path.join(_ADDON_ROOT, "resources"), os.path.join(_ADDON_ROOT, "tests", "stubs")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(python_path)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+
+    return {
+        match.group("module"): int(match.group("cumulative")) / 1000
+        for match in map(_IMPORT_TIME_PATTERN.match, result.stderr.splitlines())
+        if match is not None
+    }
+
+
+@pytest.mark.parametrize(
+    "module, budget_ms, unwanted_modules",
+    [
+        # Plugin entry point: every invocation pays for it before routing
+        ("lib.routes", 60, ["requests", "lib.providers", "lib.managers.catchup_manager", *_PLAYBACK_AND_IPTV_MODULES]),
+        # Catchup browsing needs requests and the provider, but nothing related to playback or IPTV Manager
+        ("lib.managers.catchup_manager", 600, _PLAYBACK_AND_IPTV_MODULES),
+    ],
+)
+def test_import_time(module, budget_ms, unwanted_modules):
+    """Import module within its time budget, without loading modules it does not need."""
+    runs = [get_import_times(module) for _ in range(3)]
+    import_time = min(import_times[module] for import_times in runs)
+
+    assert [unwanted for unwanted in unwanted_modules if unwanted in runs[0]] == []
+    assert import_time < budget_ms * _BUDGET_FACTOR, f"{module} imported in {import_time:.1f} ms"
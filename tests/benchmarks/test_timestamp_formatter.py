@@ -0,0 +1,30 @@
+"""Micro-benchmark of EPG timestamp formatting, against the datetime based formatting it replaced."""
+
+from datetime import datetime
+
+import pytest
+from lib.utils.epg import TimestampFormatter
+
+pytestmark = pytest.mark.benchmark
+
+# Start and stop of about 85k programs of a 14-day window
+_TIMESTAMPS = list(range(int(datetime(2026, 3, 22).timestamp()), int(datetime(2026, 4, 5).timestamp()), 7))
+
+
+def format_with_datetime() -> list:
+    """Format timestamps like get_epg used to."""
+    return [datetime.fromtimestamp(timestamp).astimezone().isoformat() for timestamp in _TIMESTAMPS]
+
+
+def format_with_timestamp_formatter() -> list:
+    """Format timestamps with a new formatter, its caches being filled along the way."""
+    formatter = TimestampFormatter()
+    return [formatter.format(timestamp) for timestamp in _TIMESTAMPS]
+
+
+@pytest.mark.parametrize(
+    "format_timestamps", [format_with_datetime, format_with_timestamp_formatter], ids=["datetime", "formatter"]
+)
+def test_format_timestamps(benchmark, format_timestamps):
+    """Format 170k timestamps."""
+    assert len(benchmark(format_timestamps)) == len(_TIMESTAMPS)
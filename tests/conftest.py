@@ -0,0 +1,101 @@
+"""Kodi environment for tests: kodistubs modules backed by addon settings defaults and a temporary profile folder."""
+
+import json
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+import xbmc
+import xbmcaddon
+import xbmcvfs
+from orange_api import FixtureAdapter, OrangeAPI
+from requests import Session
+
+ADDON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ADDON_INFO = {"id": "plugin.video.orange.fr", "name": "Orange TV", "profile": ""}
+ADDON_SETTINGS = {}
+GLOBAL_SETTINGS = {"epg.pastdaystodisplay": 7, "epg.futuredaystodisplay": 7}
+
+
+class _Settings:
+    """Addon settings read from ADDON_SETTINGS."""
+
+    def getBool(self, id: str) -> bool:
+        """Return setting as a boolean."""
+        return ADDON_SETTINGS.get(id) == "true"
+
+    def getInt(self, id: str) -> int:
+        """Return setting as an integer."""
+        return int(ADDON_SETTINGS.get(id) or 0)
+
+    def getString(self, id: str) -> str:
+        """Return setting as a string."""
+        return ADDON_SETTINGS.get(id, "")
+
+
+def load_default_settings() -> dict:
+    """Return addon settings default values, as declared in settings.xml."""
+    tree = ET.parse(os.path.join(ADDON_ROOT, "resources", "settings.xml"))
+    return {setting.get("id"): setting.get("default", "") for setting in tree.iter("setting") if setting.get("id")}
+
+
+def _execute_jsonrpc(command: str) -> str:
+    """Answer Settings.GetSettingValue calls from GLOBAL_SETTINGS."""
+    setting = json.loads(command)["params"]["setting"]
+    return json.dumps({"id": 0, "jsonrpc": "2.0", "result": {"value": GLOBAL_SETTINGS.get(setting)}})
+
+
+def _set_setting(addon: xbmcaddon.Addon, id: str, value: str) -> None:
+    """Write addon setting into ADDON_SETTINGS."""
+    ADDON_SETTINGS[id] = value
+
+
+# Applied at import time, before the addon modules create their xbmcaddon.Addon instance
+xbmcaddon.Addon.getAddonInfo = lambda addon, id: ADDON_INFO.get(id, "")
+xbmcaddon.Addon.getSettings = lambda addon: _Settings()
+xbmcaddon.Addon.getSetting = lambda addon, id: ADDON_SETTINGS.get(id, "")
+xbmcaddon.Addon.setSetting = _set_setting
+xbmcvfs.translatePath = lambda path: path
+xbmc.executeJSONRPC = _execute_jsonrpc
+
+
+@pytest.fixture(autouse=True)
+def kodi_profile(tmp_path, monkeypatch) -> str:
+    """Give each test default settings, an empty addon profile folder and fresh module level state."""
+    import lib.providers
+    import lib.utils.metrics
+    import lib.utils.request
+
+    profile = str(tmp_path / "profile")
+    os.makedirs(profile)
+
+    monkeypatch.setitem(ADDON_INFO, "profile", profile)
+    monkeypatch.setattr(lib.providers, "_PROVIDER", None)
+    monkeypatch.setattr(lib.utils.metrics, "_METRICS_ENABLED", None)
+    monkeypatch.setattr(lib.utils.request, "_SESSION", None)
+
+    ADDON_SETTINGS.clear()
+    ADDON_SETTINGS.update(load_default_settings())
+
+    return profile
+
+
+@pytest.fixture
+def settings() -> dict:
+    """Return addon settings, to be overridden by tests with string values."""
+    return ADDON_SETTINGS
+
+
+@pytest.fixture
+def orange_api(monkeypatch) -> OrangeAPI:
+    """Serve Orange API requests of the HTTP session from fixtures."""
+    import lib.utils.request
+
+    api = OrangeAPI()
+    session = Session()
+    session.mount("https://", FixtureAdapter(api))
+    session.mount("http://", FixtureAdapter(api))
+    monkeypatch.setattr(lib.utils.request, "_SESSION", session)
+
+    return api
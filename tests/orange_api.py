@@ -0,0 +1,263 @@
+"""Orange API fixtures: seeded synthetic responses shaped like the ones recorded from Orange, at realistic sizes."""
+
+import json
+import re
+from datetime import timedelta
+from http import HTTPStatus
+from random import Random
+from threading import Lock
+from typing import Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+_DAY = 24 * 60 * 60
+_DURATIONS = [10 * 60, 30 * 60, 45 * 60, 60 * 60, 90 * 60, 120 * 60]
+_GENRES = ["Série", "Film", "Magazine", "Information", "Sport", "Jeunesse", "Documentaire", "Divertissement"]
+_WORDS = (
+    "le la les un une des du de et à en pour sur dans avec par nuit jour ville mer histoire secret enquête famille "
+    "amour guerre voyage retour dernier premier grand petit nouveau monde vie temps homme femme enfant maison"
+).split()
+
+_CATCHUP_CATEGORIES_COUNT = 12
+_CATCHUP_ARTICLES_COUNT = 60
+_CATCHUP_VIDEOS_COUNT = 25
+
+_ROUTES = [
+    (re.compile(r"/api-gw/pds/v1/live/ew$"), "channels"),
+    (re.compile(r"/api-gw/live/v3/applications/STB4PC/programs$"), "programs"),
+    (re.compile(r"/api-gw/catchup/v4/applications/PC/channels$"), "catchup_channels"),
+    (re.compile(r"/api-gw/catchup/v4/applications/PC/channels/(?P<channel_id>[^/]+)$"), "catchup_categories"),
+    (
+        re.compile(
+            r"/api-gw/catchup/v4/applications/PC/channels/(?P<channel_id>[^/]+)/categories/(?P<category_id>[^/]+)$"
+        ),
+        "catchup_articles",
+    ),
+    (re.compile(r"/api-gw/catchup/v4/applications/PC/groups/(?P<group_id>[^/]+)$"), "catchup_videos"),
+    (re.compile(r"/api-gw/stream/v2/auth/accountToken/live/(?P<stream_id>[^/]+)$"), "stream"),
+    (re.compile(r"/applications/PC/videos/(?P<stream_id>[^/]+)/stream$"), "stream"),
+]
+
+
+class OrangeAPI:
+    """Answer Orange API URLs with deterministic data, encoding each response body once."""
+
+    def __init__(self, channels_count: int = 150, catchup_channels_count: int = 40, seed: int = 0):
+        """Initialize API with the number of live and catchup channels to serve."""
+        self.channels_count = channels_count
+        self.catchup_channels_count = catchup_channels_count
+        self.seed = seed
+        # Names of the routes answered with a server error, like "channels"
+        self.failing_routes = set()
+        self.requests = []
+        self._bodies = {}
+        self._day_programs = {}
+        self._lock = Lock()
+
+    def handle(self, url: str) -> Tuple[int, bytes]:
+        """Return status code and body of the response to url."""
+        self.requests.append(url)
+        parts = urlsplit(url)
+
+        for pattern, name in _ROUTES:
+            match = pattern.search(parts.path)
+
+            if match is None:
+                continue
+
+            if name in self.failing_routes:
+                return 500, b'{"message": "Internal Server Error"}'
+
+            with self._lock:
+                body = self._bodies.get(url)
+
+            if body is None:
+                query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+                body = json.dumps(getattr(self, f"get_{name}")(**match.groupdict(), **query)).encode("utf-8")
+
+                with self._lock:
+                    self._bodies[url] = body
+
+            return 200, body
+
+        return 404, b'{"message": "Not Found"}'
+
+    def get_channels(self, **query: str) -> dict:
+        """Return live channels."""
+        rng = Random(f"{self.seed}:channels")
+        channels = []
+
+        for index in range(self.channels_count):
+            epg_id = 1000 + index * 7
+            channels.append(
+                {
+                    "idEPG": epg_id,
+                    "name": f"{self._get_words(rng, 1, 3).upper()} {index}",
+                    "displayOrder": index + 1,
+                    "logos": [
+                        {"definitionType": "webTVSquare", "listLogos": [{"path": f"/logos/{epg_id}/square.png"}]},
+                        {"definitionType": "mobileAppliDark", "listLogos": [{"path": f"/logos/{epg_id}/dark.png"}]},
+                    ],
+                    "technicalChannels": {"live": [{"liveTargetURLRelativePath": f"livetv_{epg_id}_ctv"}]},
+                }
+            )
+
+        # Orange does not return channels sorted by display order
+        rng.shuffle(channels)
+        return {"channels": channels}
+
+    def get_programs(self, period: str, epgIds: str, mco: str = "OFR") -> list:
+        """Return the programs overlapping period of the requested channels."""
+        start, end = (int(value) // 1000 for value in period.split(","))
+        epg_ids = [1000 + index * 7 for index in range(self.channels_count)] if epgIds == "all" else epgIds.split(",")
+        programs = []
+
+        for epg_id in epg_ids:
+            for day in range(start // _DAY - 1, end // _DAY + 1):
+                for program in self._get_day_programs(int(epg_id), day):
+                    if program["diffusionDate"] < end and program["diffusionDate"] + program["duration"] > start:
+                        programs.append(program)
+
+        return programs
+
+    def get_catchup_channels(self) -> list:
+        """Return catchup channels."""
+        return [
+            {
+                "id": str(1000 + index * 7),
+                "name": f"channel {index}",
+                "logos": {"ref_millenials_partner_white_logo": f"https://proxymedia.woopic.com/catchup/{index}.png"},
+            }
+            for index in range(self.catchup_channels_count)
+        ]
+
+    def get_catchup_categories(self, channel_id: str) -> dict:
+        """Return catchup categories of channel."""
+        rng = Random(f"{self.seed}:categories:{channel_id}")
+        return {
+            "categories": [
+                {"id": f"{channel_id}_{index}", "name": self._get_words(rng, 1, 3)}
+                for index in range(_CATCHUP_CATEGORIES_COUNT)
+            ]
+        }
+
+    def get_catchup_articles(self, channel_id: str, category_id: str) -> dict:
+        """Return catchup articles of category."""
+        rng = Random(f"{self.seed}:articles:{category_id}")
+        return {
+            "articles": [
+                {
+                    "id": f"{category_id}_{index}",
+                    "title": self._get_words(rng, 2, 6).capitalize(),
+                    "covers": {"ref_16_9": f"https://proxymedia.woopic.com/articles/{category_id}_{index}.jpg"},
+                }
+                for index in range(_CATCHUP_ARTICLES_COUNT)
+            ]
+        }
+
+    def get_catchup_videos(self, group_id: str) -> dict:
+        """Return catchup videos of group."""
+        rng = Random(f"{self.seed}:videos:{group_id}")
+        return {
+            "videos": [
+                {
+                    "id": f"{group_id}_{index}",
+                    "title": self._get_words(rng, 2, 6).capitalize(),
+                    "covers": {"ref_16_9": f"https://proxymedia.woopic.com/videos/{group_id}_{index}.jpg"},
+                    "duration": str(rng.choice([26, 52, 90])),
+                    "genres": [rng.choice(_GENRES)],
+                    "longSummary": self._get_words(rng, 40, 120).capitalize(),
+                    "broadcastDate": (1767225600 + rng.randrange(30 * _DAY)) * 1000,
+                    "productionDate": str(rng.randrange(1970, 2026)),
+                }
+                for index in range(_CATCHUP_VIDEOS_COUNT)
+            ]
+        }
+
+    def get_stream(self, stream_id: str, **query: str) -> dict:
+        """Return stream data of a live or catchup stream."""
+        return {
+            "url": f"https://cdn.woopic.com/{stream_id}/index.mpd",
+            "protectionData": [
+                {"keySystem": "com.microsoft.playready", "laUrl": f"https://license.woopic.com/playready/{stream_id}"},
+                {"keySystem": "com.widevine.alpha", "laUrl": f"https://license.woopic.com/widevine/{stream_id}"},
+            ],
+        }
+
+    def _get_day_programs(self, epg_id: int, day: int) -> list:
+        """Return the programs of channel starting during day, the last one ending at midnight UTC."""
+        programs = self._day_programs.get((epg_id, day))
+
+        if programs is None:
+            programs = self._day_programs.setdefault((epg_id, day), self._build_day_programs(epg_id, day))
+
+        return programs
+
+    def _build_day_programs(self, epg_id: int, day: int) -> list:
+        """Generate the programs of channel starting during day."""
+        rng = Random(f"{self.seed}:programs:{epg_id}:{day}")
+        day_end = (day + 1) * _DAY
+        start = day * _DAY
+        programs = []
+
+        while start < day_end:
+            duration = min(rng.choice(_DURATIONS), day_end - start)
+            is_episode = rng.random() < 0.4
+
+            programs.append(
+                {
+                    "channelId": str(epg_id),
+                    "diffusionDate": start,
+                    "duration": duration,
+                    "programType": "EPISODE" if is_episode else rng.choice(["FILM", "EMISSION"]),
+                    "title": self._get_words(rng, 1, 5).capitalize(),
+                    "synopsis": self._get_words(rng, 20, 90).capitalize(),
+                    "genre": rng.choice(_GENRES),
+                    "genreDetailed": rng.choice([None, "Série policière", "Football", "Dessin animé"]),
+                    "covers": [
+                        {"format": "RATIO_16_9", "url": f"https://proxymedia.woopic.com/programs/{epg_id}_{start}.jpg"}
+                    ],
+                    "season": {"number": rng.randrange(1, 12), "serie": {"title": self._get_words(rng, 1, 4)}}
+                    if is_episode
+                    else None,
+                    "episodeNumber": rng.randrange(1, 24) if is_episode else None,
+                }
+            )
+            start += duration
+
+        return programs
+
+    def _get_words(self, rng: Random, min_count: int, max_count: int) -> str:
+        """Return between min_count and max_count random words."""
+        return " ".join(rng.choices(_WORDS, k=rng.randint(min_count, max_count)))
+
+
+class FixtureAdapter(BaseAdapter):
+    """Transport adapter answering requests from Orange API fixtures instead of the network."""
+
+    def __init__(self, api: OrangeAPI):
+        """Initialize adapter over API fixtures."""
+        super().__init__()
+        self.api = api
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        """Return fixture response to request."""
+        status_code, body = self.api.handle(request.url)
+
+        response = Response()
+        response.status_code = status_code
+        response.reason = HTTPStatus(status_code).phrase
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(0)
+        response._content = body
+
+        return response
+
+    def close(self) -> None:
+        """Release nothing: no connection is opened."""
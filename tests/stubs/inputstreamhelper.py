@@ -0,0 +1,16 @@
+"""Stand-in for script.module.inputstreamhelper, which is only available as a Kodi addon."""
+
+
+class Helper:
+    """Report InputStream Adaptive as installed."""
+
+    inputstream_addon = "inputstream.adaptive"
+
+    def __init__(self, protocol: str, drm: str = None):
+        """Initialize helper for protocol and DRM."""
+        self.protocol = protocol
+        self.drm = drm
+
+    def check_inputstream(self) -> bool:
+        """Return whether InputStream Adaptive supports protocol and DRM."""
+        return True
@@ -0,0 +1,30 @@
+"""Stand-in for script.module.routing, which is only available as a Kodi addon."""
+
+from typing import Callable
+
+
+class Plugin:
+    """Record routes without dispatching Kodi plugin calls."""
+
+    def __init__(self, base_url: str = None):
+        """Initialize plugin with the handle and arguments of a plugin call."""
+        self.base_url = base_url
+        self.handle = 1
+        self.args = {}
+        self.routes = {}
+
+    def route(self, pattern: str) -> Callable:
+        """Register the decorated function for pattern."""
+
+        def decorator(func: Callable) -> Callable:
+            self.routes[pattern] = func
+            return func
+
+        return decorator
+
+    def run(self, argv: list = None) -> None:
+        """Do nothing: tests call route functions directly."""
+
+    def url_for(self, func: Callable, *args, **kwargs) -> str:
+        """Return plugin URL of the route of func."""
+        return f"plugin://plugin.video.orange.fr/{func.__name__}"
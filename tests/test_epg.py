@@ -0,0 +1,65 @@
+"""Tests of EPG utils."""
+
+import time
+from datetime import datetime
+
+import pytest
+from lib.utils.epg import TimestampFormatter
+
+_TIMEZONES = ["Europe/Paris", "America/New_York", "Australia/Lord_Howe", "America/St_Johns", "Pacific/Chatham"]
+
+
+@pytest.fixture
+def local_timezone(request, monkeypatch):
+    """Switch local time zone of the process for the duration of the test."""
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available on this platform")
+
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+
+def get_dst_transitions(start: int, end: int) -> list:
+    """Return the timestamps of the hours during which local UTC offset changes, between start and end."""
+    return [
+        timestamp
+        for timestamp in range(start, end, 3600)
+        if time.localtime(timestamp).tm_gmtoff != time.localtime(timestamp + 3600).tm_gmtoff
+    ]
+
+
+@pytest.mark.parametrize("local_timezone", _TIMEZONES, indirect=True)
+def test_timestamp_formatter_matches_datetime_across_dst_transitions(local_timezone):
+    """Format the same strings as datetime around every DST transition from 2025 to 2027."""
+    transitions = get_dst_transitions(int(datetime(2025, 1, 1).timestamp()), int(datetime(2028, 1, 1).timestamp()))
+    formatter = TimestampFormatter()
+    mismatches = []
+
+    assert len(transitions) == 6
+
+    for transition in transitions:
+        # Every minute and a few odd seconds within the 3 hours around the transition, in EPG order
+        for timestamp in range(transition - 3600, transition + 7200, 60):
+            for value in [timestamp, timestamp + 7, timestamp + 59, timestamp + 0.5]:
+                expected = datetime.fromtimestamp(value).astimezone()
+
+                if formatter.format(value) != expected.isoformat():
+                    mismatches.append((value, formatter.format(value), expected.isoformat()))
+
+                if formatter.format(value, keep_microseconds=False) != expected.replace(microsecond=0).isoformat():
+                    mismatches.append((value, formatter.format(value, keep_microseconds=False)))
+
+    assert mismatches == []
+
+
+@pytest.mark.parametrize("local_timezone", _TIMEZONES, indirect=True)
+def test_timestamp_formatter_matches_datetime_over_epg_window(local_timezone):
+    """Format the same strings as datetime for the program boundaries of a 14-day EPG window."""
+    start = int(datetime(2026, 3, 22).timestamp())
+    formatter = TimestampFormatter()
+
+    for timestamp in range(start, start + 14 * 24 * 3600, 17 * 60 + 13):
+        assert formatter.format(timestamp) == datetime.fromtimestamp(timestamp).astimezone().isoformat()
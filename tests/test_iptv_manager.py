@@ -0,0 +1,71 @@
+"""Tests of the IPTV Manager integration."""
+
+import json
+import socket
+from queue import Queue
+from threading import Thread
+
+import pytest
+from lib.managers.iptv_manager import IPTVManager
+from lib.providers.fr import OrangeFranceProvider
+from lib.utils.epg import to_json
+
+
+@pytest.fixture
+def payloads() -> Queue:
+    """Return the queue of the payloads received by the socket IPTV Manager listens on."""
+    return Queue()
+
+
+@pytest.fixture
+def iptv_manager(orange_api, payloads) -> IPTVManager:
+    """Return an IPTV Manager interface sending payloads to a local socket."""
+    server = socket.create_server(("127.0.0.1", 0))
+
+    def serve() -> None:
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+
+            with connection, connection.makefile("rb") as stream:
+                payloads.put(stream.read())
+
+    Thread(target=serve, daemon=True).start()
+
+    iptv_manager = IPTVManager(server.getsockname()[1])
+    iptv_manager.provider = OrangeFranceProvider()
+
+    yield iptv_manager
+    server.close()
+
+
+def test_send_channels(iptv_manager, payloads, settings):
+    """Send the same bytes as JSON encoding of the whole JSON-STREAMS data."""
+    settings["artwork.cache"] = "false"
+    iptv_manager.send_channels()
+
+    expected = json.dumps(dict(version=1, streams=iptv_manager.provider.get_streams()))
+
+    assert payloads.get(timeout=10) == expected.encode()
+
+
+def test_send_epg(iptv_manager, payloads):
+    """Send the same bytes as JSON encoding of the whole JSON-EPG data, one channel at a time."""
+    epg = iptv_manager.provider.get_epg()
+    iptv_manager.provider.get_epg = lambda: epg
+    iptv_manager.send_epg()
+
+    expected = json.dumps(dict(version=1, epg=epg), default=to_json)
+
+    assert len(epg) == 150
+    assert payloads.get(timeout=10) == expected.encode()
+
+
+def test_send_epg_without_programs(iptv_manager, payloads):
+    """Send an empty JSON-EPG data when there is no program."""
+    iptv_manager.provider.get_epg = lambda: {}
+    iptv_manager.send_epg()
+
+    assert json.loads(payloads.get(timeout=10)) == {"version": 1, "epg": {}}
@@ -0,0 +1,95 @@
+"""Tests of the cross-process lock."""
+
+import os
+from time import monotonic, time
+
+import pytest
+from lib.utils.lock import FileLock
+
+
+@pytest.fixture
+def lock_filepath(tmp_path) -> str:
+    """Return the path of a lock file."""
+    return str(tmp_path / "data.lock")
+
+
+def make_stale(filepath: str) -> None:
+    """Age lock file as if its owner had been holding it for an hour."""
+    os.utime(filepath, (time() - 3600,) * 2)
+
+
+def test_acquire_and_release(lock_filepath):
+    """Hold the lock as long as its lock file exists."""
+    with FileLock(lock_filepath) as lock:
+        assert lock.acquired
+        assert os.path.exists(lock_filepath)
+
+    assert not lock.acquired
+    assert not os.path.exists(lock_filepath)
+
+
+def test_acquire_times_out_while_lock_is_held(lock_filepath):
+    """Give up waiting for a lock held by someone else after timeout."""
+    holder = FileLock(lock_filepath)
+    holder.acquire()
+
+    waiter = FileLock(lock_filepath, timeout=0.2)
+    started_at = monotonic()
+
+    assert not waiter.acquire()
+    assert monotonic() - started_at >= 0.2
+
+    # Releasing a lock which has not been acquired leaves the holder's lock alone
+    waiter.release()
+    assert os.path.exists(lock_filepath)
+
+    holder.release()
+    assert waiter.acquire()
+
+
+def test_acquire_breaks_lock_left_by_crashed_process(lock_filepath):
+    """Break a lock whose owner died without releasing it, once it is older than stale_after."""
+    FileLock(lock_filepath).acquire()
+    make_stale(lock_filepath)
+
+    lock = FileLock(lock_filepath, timeout=0.2)
+
+    assert lock.acquire()
+
+    with open(lock_filepath, encoding="utf-8") as file:
+        assert file.read() == lock.token
+
+
+def test_release_keeps_lock_taken_over_by_waiter(lock_filepath):
+    """Leave the lock to the waiter which broke it, when its stale owner eventually releases it."""
+    holder = FileLock(lock_filepath)
+    holder.acquire()
+    make_stale(lock_filepath)
+
+    waiter = FileLock(lock_filepath, timeout=0.2)
+    assert waiter.acquire()
+
+    holder.release()
+
+    assert not FileLock(lock_filepath, timeout=0.2).acquire()
+
+    waiter.release()
+    assert not os.path.exists(lock_filepath)
+
+
+def test_acquire_does_not_break_lock_taken_after_stale_one(lock_filepath):
+    """Only remove the stale lock file a waiter saw, not the one another waiter created after breaking it."""
+    FileLock(lock_filepath).acquire()
+    make_stale(lock_filepath)
+
+    late_waiter = FileLock(lock_filepath, timeout=0.2)
+    stale_token = late_waiter._get_stale_token()
+
+    first_waiter = FileLock(lock_filepath, timeout=0.2)
+    assert first_waiter.acquire()
+
+    late_waiter._remove_if_owned_by(stale_token)
+
+    assert not late_waiter.acquire()
+    first_waiter.release()
+    assert not os.path.exists(lock_filepath)
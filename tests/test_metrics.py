@@ -0,0 +1,84 @@
+"""Tests of request metrics utils."""
+
+import pytest
+from lib.providers import abstract_orange_provider as orange
+from lib.providers.fr import free_oqee as oqee
+from lib.utils.metrics import get_endpoint_template
+
+_ORANGE_TV = "rp-ott-mediation-tv.woopic.com/api-gw"
+_ORANGE_STREAMS = "mediation-tv.orange.fr/all/api-gw"
+
+
+@pytest.mark.parametrize(
+    "url, template",
+    [
+        (
+            orange._CHANNELS_ENDPOINT,
+            f"{_ORANGE_TV}/pds/v1/live/ew",
+        ),
+        (
+            orange._PROGRAMS_ENDPOINT.format(period="1767225600000,1767268800000", epg_ids="192,4,80", mco="OFR"),
+            f"{_ORANGE_TV}/live/v3/applications/STB4PC/programs",
+        ),
+        (
+            orange._CATCHUP_CHANNELS_ENDPOINT,
+            f"{_ORANGE_TV}/catchup/v4/applications/PC/channels",
+        ),
+        (
+            f"{orange._CATCHUP_CHANNELS_ENDPOINT}/tf1",
+            f"{_ORANGE_TV}/catchup/v4/applications/PC/channels/{{channel_id}}",
+        ),
+        (
+            orange._CATCHUP_ARTICLES_ENDPOINT.format(channel_id="1", category_id="cat_55"),
+            f"{_ORANGE_TV}/catchup/v4/applications/PC/channels/{{channel_id}}/categories/{{category_id}}",
+        ),
+        (
+            orange._CATCHUP_VIDEOS_ENDPOINT.format(group_id="grp-abc123"),
+            f"{_ORANGE_TV}/catchup/v4/applications/PC/groups/{{group_id}}",
+        ),
+        (
+            orange._LIVE_STREAM_ENDPOINT.format(stream_id="livetv_tf1_ctv"),
+            f"{_ORANGE_STREAMS}/stream/v2/auth/accountToken/live/{{stream_id}}",
+        ),
+        (
+            orange._LIVE_STREAM_ENDPOINT.format(stream_id="livetv_1000_ctv"),
+            f"{_ORANGE_STREAMS}/stream/v2/auth/accountToken/live/{{stream_id}}",
+        ),
+        (
+            orange._CATCHUP_STREAM_ENDPOINT.format(stream_id="abc123"),
+            f"{_ORANGE_STREAMS}/catchup/v4/auth/accountToken/applications/PC/videos/{{stream_id}}/stream",
+        ),
+        (
+            orange._STREAM_LOGO_URL.format(path="/logos/1000/dark.png"),
+            "proxymedia.woopic.com/api/v1/images/2090{path}",
+        ),
+        (
+            oqee._SERVICE_PLAN_ENDPOINT,
+            "api.oqee.net/api/v5/service_plan",
+        ),
+        (
+            oqee._STREAM_LOGO_URL.format(stream_id="612"),
+            "img1.dc2.oqee.net/channel_pictures/{stream_id}/w200",
+        ),
+    ],
+)
+def test_get_endpoint_template_of_known_endpoints(url, template):
+    """Aggregate requests to known endpoints under their format string."""
+    assert get_endpoint_template(url) == template
+
+
+@pytest.mark.parametrize(
+    "url, template",
+    [
+        ("https://proxymedia.woopic.com/340/p/169_EMI_3564281.jpg", "proxymedia.woopic.com/{id}/p/{file}"),
+        ("https://login.orange.fr/api/login", "login.orange.fr/api/login"),
+        ("https://tv.orange.fr/", "tv.orange.fr/"),
+        (
+            "https://example.com/v2/items/2d6f7e4c-1b3a-4c5d-9e8f-0a1b2c3d4e5f/STB4PC",
+            "example.com/v2/items/{id}/STB4PC",
+        ),
+    ],
+)
+def test_get_endpoint_template_of_unknown_endpoints(url, template):
+    """Replace ids and file names in the path of unknown endpoints."""
+    assert get_endpoint_template(url) == template
@@ -0,0 +1,50 @@
+"""Tests of the Orange provider against Orange API fixtures."""
+
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from lib.providers.fr import OrangeFranceProvider
+
+
+@pytest.fixture
+def provider(orange_api) -> OrangeFranceProvider:
+    """Return an Orange France provider served by Orange API fixtures."""
+    return OrangeFranceProvider()
+
+
+def get_programs_epg_ids(urls: list) -> set:
+    """Return the epgIds parameters of the programs requests among urls."""
+    return {parse_qs(urlsplit(url).query)["epgIds"][0] for url in urls if urlsplit(url).path.endswith("/programs")}
+
+
+def test_get_epg_requests_lineup_channels(provider, orange_api):
+    """Request the programs of the lineup channels only."""
+    epg = provider.get_epg()
+
+    assert len(epg) == orange_api.channels_count
+    assert "all" not in get_programs_epg_ids(orange_api.requests)
+
+
+def test_get_epg_without_channels(provider, orange_api):
+    """Load the programs of all channels when the channel list cannot be loaded."""
+    orange_api.failing_routes.add("channels")
+
+    assert provider.get_streams() == []
+
+    epg = provider.get_epg()
+
+    assert len(epg) == orange_api.channels_count
+    assert get_programs_epg_ids(orange_api.requests) == {"all"}
+
+
+def test_prefetch_catchup_items(provider, orange_api):
+    """Serve prefetched catchup levels from cache."""
+    levels_list = [["1000", f"1000_{index}"] for index in range(10)]
+    provider.prefetch_catchup_items(levels_list)
+
+    assert len(orange_api.requests) == 10
+
+    for levels in levels_list:
+        assert len(provider.get_catchup_items(levels)) > 0
+
+    assert len(orange_api.requests) == 10
@@ -0,0 +1,22 @@
+"""Tests of the stream manager."""
+
+import os
+from time import time
+
+from lib.managers.stream_manager import _STREAM_INFO_TTL, StreamManager
+
+
+def test_get_stream_info_prunes_expired_stream_infos():
+    """Remove the stream infos written before the stream info lifetime when loading a new one."""
+    stream_manager = StreamManager()
+    stream_manager.cache.set("expired", {"expires_at": time() - 60, "stream_info": {"path": "expired"}})
+    stream_manager.cache.set("valid", {"expires_at": time() + 60, "stream_info": {"path": "valid"}})
+
+    expired_filepath = stream_manager.cache._get_filepath("expired")
+    os.utime(expired_filepath, (time() - _STREAM_INFO_TTL - 60,) * 2)
+
+    stream_info = stream_manager._get_stream_info("new", lambda stream_id: {"path": stream_id}, "livetv_tf1_ctv")
+
+    assert stream_info == {"path": "livetv_tf1_ctv"}
+    assert sorted(stream_manager.cache.list_keys()) == ["new", "valid"]
+    assert stream_manager._get_stream_info("valid", None, "livetv_tf1_ctv") == {"path": "valid"}